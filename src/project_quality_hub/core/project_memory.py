@@ -5,12 +5,13 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import os
 import pickle
 import shutil
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .project_mind import CodeEntity, FileNode, ProjectContext, ProjectKnowledgeGraph
 
@@ -167,6 +168,7 @@ class ProjectMemoryManager:
                 -- 创建索引优化查询性能
                 CREATE INDEX IF NOT EXISTS idx_projects_root ON projects(project_root);
                 CREATE INDEX IF NOT EXISTS idx_projects_updated ON projects(updated_at);
+                CREATE INDEX IF NOT EXISTS idx_projects_active_accessed ON projects(is_active, last_accessed);
                 CREATE INDEX IF NOT EXISTS idx_files_project ON files(project_id);
                 CREATE INDEX IF NOT EXISTS idx_files_hash ON files(file_hash);
                 CREATE INDEX IF NOT EXISTS idx_entities_project ON entities(project_id);
@@ -180,6 +182,20 @@ class ProjectMemoryManager:
         """根据项目路径生成项目ID"""
         return hashlib.md5(str(Path(project_root).absolute()).encode()).hexdigest()
     
+    def storage_version(self, project_root: str) -> Tuple[int, int]:
+        """返回项目持久化数据的版本戳（缓存文件与数据库的 mtime_ns），不存在的文件记为 0
+
+        只需两次 stat，调用方可据此判断结果是否需要重新 load_project
+        """
+        cache_file = self.cache_dir / f"{self.get_project_id(project_root)}.pkl"
+        stamps = []
+        for path in (cache_file, self.db_path):
+            try:
+                stamps.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                stamps.append(0)
+        return stamps[0], stamps[1]
+    
     def save_project(self, knowledge_graph: ProjectKnowledgeGraph) -> bool:
         """保存项目知识图谱到持久化存储"""
         try:
@@ -539,7 +555,11 @@ class ProjectMemoryManager:
         return True
     
     def get_project_list(self) -> List[Dict[str, Any]]:
-        """获取所有项目列表"""
+        """获取所有项目列表
+
+        仅读取projects表的摘要列，不反序列化任何知识图谱；
+        (is_active, last_accessed) 索引让排序直接走索引扫描。
+        """
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.execute('''
@@ -550,20 +570,8 @@ class ProjectMemoryManager:
                     ORDER BY last_accessed DESC
                 ''')
                 
-                projects = []
-                for row in cursor.fetchall():
-                    projects.append({
-                        'project_name': row[0],
-                        'project_root': row[1],
-                        'framework_type': row[2],
-                        'main_language': row[3],
-                        'total_files': row[4],
-                        'total_lines': row[5],
-                        'last_accessed': row[6],
-                        'created_at': row[7]
-                    })
-                
-                return projects
+                columns = [col[0] for col in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
         
         except Exception as e:
             logger.error(f"获取项目列表失败: {e}")
@@ -17,11 +17,11 @@ import hashlib
 import json
 import logging
 import re
-from collections import defaultdict
-from dataclasses import dataclass, field, asdict
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 import networkx as nx
 
@@ -58,6 +58,7 @@ class FileNode:
     entities: List[CodeEntity] = field(default_factory=list)
     risk_score: float = 0.0
     change_frequency: int = 0
+    dirty: bool = False  # 上游依赖变更后待重新评分
 
 
 @dataclass
@@ -513,31 +514,55 @@ class ProjectKnowledgeGraph:
     def _build_dependency_graph(self) -> int:
         """构建依赖关系图"""
         dependency_count = 0
+        resolve_cache: Dict[tuple, Optional[str]] = {}
         
         for file_path, file_node in self.files.items():
-            # 添加文件节点到图中
-            self.graph.add_node(file_path, node_type='file', data=file_node)
-            
-            # 添加import依赖
-            for import_name in file_node.imports:
-                # 尝试解析到实际文件
-                target_file = self._resolve_import(import_name, file_path)
-                if target_file and target_file in self.files:
-                    self.graph.add_edge(file_path, target_file, 
-                                       relation_type='imports', 
-                                       strength=0.8)
-                    dependency_count += 1
-            
-            # 添加实体节点和关系
-            for entity in file_node.entities:
-                entity_key = f"{file_path}:{entity.name}"
-                self.graph.add_node(entity_key, node_type='entity', data=entity)
-                self.graph.add_edge(file_path, entity_key, 
-                                   relation_type='contains',
-                                   strength=1.0)
+            dependency_count += self._link_file(file_path, file_node, resolve_cache)
+        
+        return dependency_count
+    
+    def _link_file(self, file_path: str, file_node: FileNode,
+                   resolve_cache: Optional[Dict[tuple, Optional[str]]] = None) -> int:
+        """将单个文件及其依赖、实体写入依赖图，返回新增的import依赖数
+
+        ``resolve_cache`` 在一次批量处理内共享import解析结果，同一目录下
+        多个文件引用同一模块时只解析一次。
+        """
+        dependency_count = 0
+        
+        # 添加文件节点到图中
+        self.graph.add_node(file_path, node_type='file', data=file_node)
+        
+        # 添加import依赖
+        for import_name in file_node.imports:
+            # 尝试解析到实际文件
+            target_file = self._resolve_import_cached(import_name, file_path, resolve_cache)
+            if target_file and target_file in self.files:
+                self.graph.add_edge(file_path, target_file, 
+                                   relation_type='imports', 
+                                   strength=0.8)
+                dependency_count += 1
+        
+        # 添加实体节点和关系
+        for entity in file_node.entities:
+            entity_key = f"{file_path}:{entity.name}"
+            self.graph.add_node(entity_key, node_type='entity', data=entity)
+            self.graph.add_edge(file_path, entity_key, 
+                               relation_type='contains',
+                               strength=1.0)
         
         return dependency_count
     
+    def _resolve_import_cached(self, import_name: str, from_file: str,
+                               resolve_cache: Optional[Dict[tuple, Optional[str]]] = None) -> Optional[str]:
+        """带批次缓存的 _resolve_import，缓存键为 (import, 所在目录)"""
+        if resolve_cache is None:
+            return self._resolve_import(import_name, from_file)
+        cache_key = (import_name, str(Path(from_file).parent))
+        if cache_key not in resolve_cache:
+            resolve_cache[cache_key] = self._resolve_import(import_name, from_file)
+        return resolve_cache[cache_key]
+    
     def _resolve_import(self, import_name: str, from_file: str) -> Optional[str]:
         """解析import到实际文件路径"""
         # 简化版本的import解析
@@ -565,27 +590,54 @@ class ProjectKnowledgeGraph:
     
     def _calculate_risk_scores(self):
         """计算风险评分"""
-        for file_path, file_node in self.files.items():
-            # 基于复杂度和依赖关系计算风险
-            risk_factors = []
-            
-            # 文件大小风险
-            if file_node.size_bytes > 10000:  # >10KB
-                risk_factors.append(0.3)
-            
-            # 行数风险
-            if file_node.line_count > 500:
-                risk_factors.append(0.4)
-            
-            # 实体数量风险
-            if len(file_node.entities) > 20:
-                risk_factors.append(0.3)
-            
-            # 依赖数量风险
-            if len(file_node.imports) > 15:
-                risk_factors.append(0.2)
-            
-            file_node.risk_score = min(1.0, sum(risk_factors))
+        for file_node in self.files.values():
+            self._score_file(file_node)
+    
+    def _score_file(self, file_node: FileNode):
+        """基于复杂度和依赖关系计算单个文件的风险"""
+        risk_factors = []
+        
+        # 文件大小风险
+        if file_node.size_bytes > 10000:  # >10KB
+            risk_factors.append(0.3)
+        
+        # 行数风险
+        if file_node.line_count > 500:
+            risk_factors.append(0.4)
+        
+        # 实体数量风险
+        if len(file_node.entities) > 20:
+            risk_factors.append(0.3)
+        
+        # 依赖数量风险
+        if len(file_node.imports) > 15:
+            risk_factors.append(0.2)
+        
+        file_node.risk_score = min(1.0, sum(risk_factors))
+        file_node.dirty = False
+    
+    def invalidate_dependents(self, file_paths: Iterable[str]) -> Set[str]:
+        """沿反向依赖边广度优先遍历，将所有下游文件标记为dirty并返回"""
+        dirty: Set[str] = set()
+        queue = deque(file_paths)
+        while queue:
+            file_path = queue.popleft()
+            if file_path not in self.graph:
+                continue
+            for dependent in self.graph.predecessors(file_path):
+                if dependent in dirty or dependent not in self.files:
+                    continue
+                dirty.add(dependent)
+                self.files[dependent].dirty = True
+                queue.append(dependent)
+        return dirty
+    
+    def recompute_scores(self, file_paths: Iterable[str]):
+        """仅对指定文件重新计算风险评分"""
+        for file_path in file_paths:
+            file_node = self.files.get(file_path)
+            if file_node is not None:
+                self._score_file(file_node)
     
     def _update_context_statistics(self):
         """更新上下文统计信息"""
@@ -700,7 +752,8 @@ class ProjectKnowledgeGraph:
         core_entities = [e for e in self.entities.values() if e.usage_count > 5]
         
         return {
-            'project_context': asdict(self.context),
+            # 浅拷贝字段即可：asdict 会深拷贝整棵结构，而调用方序列化时还会再遍历一遍
+            'project_context': dict(self.context.__dict__),
             'statistics': {
                 'total_files': len(self.files),
                 'total_entities': len(self.entities),
@@ -2,26 +2,79 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import os
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime, time
+from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from .project_mind import ProjectKnowledgeGraph
 from .project_memory import get_memory_manager
 
+try:  # 可选依赖：orjson一次性直接编码为bytes
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj: Any) -> Any:
+    """按orjson的规则编码非原生类型，保证两种后端输出一致"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    raise TypeError(f'Type is not JSON serializable: {type(obj).__name__}')
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        payload, ensure_ascii=False, separators=(',', ':'), default=_json_default
+    ).encode('utf-8')
+
+
+def _loads(data: bytes) -> Dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _normalize_root(project_root: str) -> str:
+    """返回项目根目录的绝对路径；相对路径按当前工作目录区分缓存"""
+    if os.path.isabs(project_root):
+        return _absolute_root(project_root, None)
+    return _absolute_root(project_root, os.getcwd())
+
+
+@lru_cache(maxsize=128)
+def _absolute_root(project_root: str, cwd: Optional[str]) -> str:
+    if cwd is None:
+        return str(Path(project_root).absolute())
+    return str(Path(cwd, project_root))
+
+
 class ProjectMindInterface:
     """ProjectMind的Claude集成接口"""
     
     def __init__(self):
         self.memory_manager = get_memory_manager()
+        # 文件上下文的序列化结果，键包含文件hash与依赖关系，文件未变更时直接复用
+        self._file_context_cache: OrderedDict[tuple, bytes] = OrderedDict()
+        self.max_file_context_cache = 256
     
     def analyze_project(self, project_root: str, force_reanalysis: bool = False) -> Dict[str, Any]:
         """分析项目并返回结果"""
-        project_root = str(Path(project_root).absolute())
+        project_root = _normalize_root(project_root)
         
         if not Path(project_root).exists():
             return {'error': f'项目路径不存在: {project_root}'}
@@ -66,22 +119,36 @@ class ProjectMindInterface:
     
     def get_file_context(self, project_root: str, file_path: str) -> Dict[str, Any]:
         """获取文件上下文信息"""
+        return _loads(self.get_file_context_bytes(project_root, file_path))
+
+    def get_file_context_bytes(self, project_root: str, file_path: str) -> bytes:
+        """获取JSON编码的文件上下文，未变更的文件直接返回缓存的bytes"""
         try:
             knowledge_graph = self.memory_manager.load_project(project_root)
             if not knowledge_graph:
-                return {'error': '项目未分析，请先运行项目分析'}
+                return _dumps({'error': '项目未分析，请先运行项目分析'})
             
             if not os.path.isabs(file_path):
                 file_path = os.path.join(project_root, file_path)
             
             if file_path not in knowledge_graph.files:
-                return {'error': f'文件未找到: {file_path}'}
+                return _dumps({'error': f'文件未找到: {file_path}'})
             
             file_node = knowledge_graph.files[file_path]
             dependencies = knowledge_graph.get_file_dependencies(file_path)
             dependents = knowledge_graph.get_file_dependents(file_path)
+
+            cache_key = (
+                project_root, file_path, file_node.file_hash,
+                file_node.last_modified, file_node.risk_score,
+                tuple(dependencies), tuple(dependents),
+            )
+            cached = self._file_context_cache.get(cache_key)
+            if cached is not None:
+                self._file_context_cache.move_to_end(cache_key)
+                return cached
             
-            return {
+            data = _dumps({
                 'file_info': {
                     'path': file_path,
                     'language': file_node.language,
@@ -104,10 +171,15 @@ class ProjectMindInterface:
                 'dependents': dependents,
                 'imports': file_node.imports,
                 'exports': file_node.exports
-            }
+            })
+
+            self._file_context_cache[cache_key] = data
+            if len(self._file_context_cache) > self.max_file_context_cache:
+                self._file_context_cache.popitem(last=False)
+            return data
         
         except Exception as e:
-            return {'error': f'获取文件上下文失败: {str(e)}'}
+            return _dumps({'error': f'获取文件上下文失败: {str(e)}'})
     
     def search_entities(self, project_root: str, entity_name: str) -> Dict[str, Any]:
         """搜索代码实体"""
@@ -141,7 +213,7 @@ class ProjectMindInterface:
     def get_project_summary(self, project_root: str) -> Dict[str, Any]:
         """获取项目摘要"""
         try:
-            project_root = str(Path(project_root).absolute())
+            project_root = _normalize_root(project_root)
             knowledge_graph = self.memory_manager.load_project(project_root)
             if not knowledge_graph:
                 return {'error': '项目未分析，请先运行项目分析'}
@@ -152,7 +224,7 @@ class ProjectMindInterface:
     def update_project(self, project_root: str) -> Dict[str, Any]:
         """增量更新项目"""
         try:
-            project_root = str(Path(project_root).absolute())
+            project_root = _normalize_root(project_root)
             success = self.memory_manager.update_project_incremental(project_root)
             
             if success:
@@ -2,42 +2,60 @@
 
 from __future__ import annotations
 
+import errno
 import hashlib
 import logging
 import os
 import subprocess
 import threading
+import time
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import FileCreatedEvent, FileDeletedEvent, FileModifiedEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 from watchdog.observers.polling import PollingObserver
 
+try:  # 可选依赖：Linux下直接使用inotify，避免轮询全量扫描
+    import inotify_simple
+except (ImportError, OSError):  # pragma: no cover - optional dependency
+    inotify_simple = None
+
 from .project_mind import FileNode, ProjectKnowledgeGraph
 from .project_memory import ProjectMemoryManager
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class FileChangeInfo:
     """文件变更信息"""
     file_path: str
     change_type: str  # 'created', 'modified', 'deleted', 'moved'
     old_hash: Optional[str] = None
     new_hash: Optional[str] = None
-    timestamp: datetime = None
+    timestamp: Optional[float] = None  # time.time() 秒级时间戳，读取时再转换
     content_changed: bool = False
     metadata_changed: bool = False
 
+    @property
+    def changed_at(self) -> Optional[datetime]:
+        """以datetime形式返回变更时间"""
+        if self.timestamp is None:
+            return None
+        return datetime.fromtimestamp(self.timestamp)
+
 class SmartFileHandler(FileSystemEventHandler):
     """智能文件监控处理器"""
 
     def __init__(self, update_manager):
         self.update_manager = update_manager
-        self.batch_changes: Dict[str, FileChangeInfo] = {}
+        # 批处理期间按列存储变更，提交处理时才构造FileChangeInfo
+        self._batch_type: Dict[str, str] = {}
+        self._batch_hash: Dict[str, Optional[str]] = {}
+        self._batch_time: Dict[str, float] = {}
         self.batch_timer = None
         self.batch_delay = 2.0  # 2秒批处理延迟
 
@@ -74,14 +92,9 @@ class SmartFileHandler(FileSystemEventHandler):
             except Exception:
                 pass
 
-        change_info = FileChangeInfo(
-            file_path=file_path,
-            change_type=change_type,
-            new_hash=new_hash,
-            timestamp=datetime.now()
-        )
-
-        self.batch_changes[file_path] = change_info
+        self._batch_type[file_path] = change_type
+        self._batch_hash[file_path] = new_hash
+        self._batch_time[file_path] = time.time()
 
         # 重置批处理定时器
         if self.batch_timer:
@@ -92,9 +105,20 @@ class SmartFileHandler(FileSystemEventHandler):
 
     def _process_batch_changes(self):
         """批处理文件变更"""
-        if self.batch_changes:
-            changes = dict(self.batch_changes)
-            self.batch_changes.clear()
+        if self._batch_type:
+            types, self._batch_type = self._batch_type, {}
+            hashes, self._batch_hash = self._batch_hash, {}
+            times, self._batch_time = self._batch_time, {}
+
+            changes = {
+                file_path: FileChangeInfo(
+                    file_path=file_path,
+                    change_type=change_type,
+                    new_hash=hashes.get(file_path),
+                    timestamp=times.get(file_path)
+                )
+                for file_path, change_type in types.items()
+            }
 
             # 异步处理变更
             threading.Thread(
@@ -103,6 +127,136 @@ class SmartFileHandler(FileSystemEventHandler):
                 daemon=True
             ).start()
 
+class InotifyObserver:
+    """基于inotify_simple的轻量监控器，兼容watchdog Observer的调度接口
+
+    只在写入完成（CLOSE_WRITE）、移入、移出和删除时分发事件，忽略每次
+    write()都会触发的MODIFY事件，CPU开销与事件速率而非目录规模成正比。
+    """
+
+    ignore_dirs = frozenset({'.git', 'node_modules', '__pycache__', '.venv', 'venv'})
+
+    def __init__(self, read_timeout_ms: int = 1000, read_delay_ms: int = 50):
+        if inotify_simple is None:
+            raise RuntimeError("inotify_simple 未安装")
+        self.read_timeout_ms = read_timeout_ms
+        self.read_delay_ms = read_delay_ms
+        self._watches = []
+        self._wd_paths: Dict[int, str] = {}
+        self._inotify = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # 监控线程异常退出时的回调，调用方据此改用其他监控实现
+        self.on_error: Optional[Callable[[Exception], None]] = None
+
+    @property
+    def _file_mask(self) -> int:
+        flags = inotify_simple.flags
+        return flags.CLOSE_WRITE | flags.MOVED_TO | flags.MOVED_FROM | flags.DELETE | flags.CREATE
+
+    def schedule(self, event_handler: FileSystemEventHandler, path: str, recursive: bool = False):
+        self._watches.append((event_handler, str(path), recursive))
+
+    def start(self):
+        """在调用线程中为各根目录添加watch，目录不存在或watch数达到上限时直接抛出，
+        以便调用方改用其他监控实现"""
+        self._inotify = inotify_simple.INotify()
+        try:
+            for _, path, recursive in self._watches:
+                self._add_tree(path, recursive, strict=True)
+        except Exception:
+            self._inotify.close()
+            self._inotify = None
+            self._wd_paths.clear()
+            raise
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="InotifyObserver", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _add_tree(self, root: str, recursive: bool, strict: bool = False, report_existing: bool = False) -> List[str]:
+        """批量为目录树添加watch，``report_existing`` 时返回树中已有的文件
+
+        先添加watch再列目录，添加watch之前已写入的文件由返回值补报，之后的由事件报告。
+        ``strict`` 时根目录无法监控或watch数达到上限（ENOSPC）直接抛出，否则记录日志并跳过。
+        """
+        mask = self._file_mask
+        existing: List[str] = []
+        pending = [root]
+        while pending:
+            dir_path = pending.pop()
+            try:
+                wd = self._inotify.add_watch(dir_path, mask)
+            except OSError as exc:
+                if strict and (dir_path == root or exc.errno == errno.ENOSPC):
+                    raise
+                logger.warning("无法监控目录 %s: %s", dir_path, exc)
+                continue
+            self._wd_paths[wd] = dir_path
+            if not recursive and not report_existing:
+                continue
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and entry.name not in self.ignore_dirs:
+                                pending.append(entry.path)
+                        elif report_existing and entry.is_file():
+                            existing.append(entry.path)
+            except OSError as exc:
+                logger.warning("无法读取目录 %s: %s", dir_path, exc)
+        return existing
+
+    def _dispatch(self, fs_event):
+        for handler, _, _ in self._watches:
+            handler.dispatch(fs_event)
+
+    def _run(self):
+        flags = inotify_simple.flags
+        try:
+            while not self._stop_event.is_set():
+                events = self._inotify.read(timeout=self.read_timeout_ms, read_delay=self.read_delay_ms)
+                for event in events:
+                    if event.mask & flags.Q_OVERFLOW:
+                        logger.warning("inotify事件队列溢出，部分变更可能丢失")
+                        continue
+                    if event.mask & flags.IGNORED:
+                        self._wd_paths.pop(event.wd, None)
+                        continue
+
+                    parent = self._wd_paths.get(event.wd)
+                    if parent is None or not event.name:
+                        continue
+                    full_path = os.path.join(parent, event.name)
+
+                    if event.mask & flags.ISDIR:
+                        # 新建或移入的目录需要补充watch，并补报watch生效前已写入其中的文件
+                        if event.mask & (flags.CREATE | flags.MOVED_TO) and event.name not in self.ignore_dirs:
+                            for file_path in self._add_tree(full_path, recursive=True, report_existing=True):
+                                self._dispatch(FileCreatedEvent(file_path))
+                        continue
+
+                    if event.mask & (flags.CLOSE_WRITE | flags.MOVED_TO):
+                        self._dispatch(FileModifiedEvent(full_path))
+                    elif event.mask & (flags.DELETE | flags.MOVED_FROM):
+                        self._dispatch(FileDeletedEvent(full_path))
+        except Exception as exc:
+            logger.error("inotify监控线程异常退出: %s", exc)
+            if self.on_error is not None:
+                self.on_error(exc)
+        finally:
+            self._inotify.close()
+
+
 class SmartIncrementalUpdater:
     """智能增量更新管理器"""
 
@@ -113,6 +267,15 @@ class SmartIncrementalUpdater:
         self.monitoring = False
         self._observer_class = None
 
+        # 监控实现在更新器生命周期内不变，初始化时确定一次
+        self._force_polling = self._should_force_polling()
+        if self._force_polling:
+            self._observer_candidates = (PollingObserver,)
+        elif inotify_simple is not None:
+            self._observer_candidates = (InotifyObserver, Observer, PollingObserver)
+        else:
+            self._observer_candidates = (Observer, PollingObserver)
+
         # 忽略的文件模式
         self.ignore_patterns = {
             '.git', '.DS_Store', '__pycache__', 'node_modules',
@@ -129,7 +292,8 @@ class SmartIncrementalUpdater:
             '.less', '.html', '.htm'
         }
 
-    def _should_force_polling(self) -> bool:
+    @staticmethod
+    def _should_force_polling() -> bool:
         """检查是否强制使用轮询监控"""
         flag = os.environ.get("WATCHDOG_FORCE_POLLING", "")
         if not flag:
@@ -137,10 +301,8 @@ class SmartIncrementalUpdater:
         return flag.lower() not in {"0", "false", "no"}
 
     def _candidate_observers(self):
-        """生成可用的监控实现列表"""
-        if self._should_force_polling():
-            return [PollingObserver]
-        return [Observer, PollingObserver]
+        """生成可用的监控实现列表（初始化时确定）"""
+        return self._observer_candidates
 
     def _should_monitor_file(self, file_path: str) -> bool:
         """判断是否应该监控此文件"""
@@ -246,9 +408,23 @@ class SmartIncrementalUpdater:
         updated_files = set()
         affected_entities = set()
 
-        for file_path, change_info in changes.items():
+        # 本批次内共享的import解析缓存，批处理结束即释放
+        resolve_cache: Dict[tuple, Optional[str]] = {}
+
+        # 先登记本批次所有新建/修改文件的节点，再统一链接依赖：
+        # 同批新建的文件相互引用时，链接时目标已在 files 中，结果与完整分析一致
+        to_link: Dict[str, FileNode] = {}
+        # 本批新加入图谱的文件；新建文件的事件常以 modified 结尾，故按是否已在图谱中判断
+        created: Set[str] = set()
+        for file_path in self._order_changes(knowledge_graph, changes):
+            change_info = changes[file_path]
             try:
-                self._process_single_file_change(knowledge_graph, change_info)
+                known = file_path in knowledge_graph.files
+                file_node = self._process_single_file_change(knowledge_graph, change_info)
+                if file_node is not None:
+                    to_link[file_path] = file_node
+                    if not known:
+                        created.add(file_path)
                 updated_files.add(file_path)
 
                 # 分析影响的实体
@@ -259,9 +435,16 @@ class SmartIncrementalUpdater:
             except Exception as e:
                 logger.error(f"处理文件变更失败 {file_path}: {e}")
 
-        # 更新依赖关系
+        for file_path, file_node in to_link.items():
+            knowledge_graph._link_file(file_path, file_node, resolve_cache)
+        if created:
+            self._link_importers_of_created(knowledge_graph, created, to_link.keys(), resolve_cache)
+
+        # 仅对变更文件及其反向可达的下游文件重新评分
         if updated_files:
-            self._update_dependencies(knowledge_graph, updated_files)
+            dirty_files = knowledge_graph.invalidate_dependents(updated_files)
+            knowledge_graph.recompute_scores(updated_files | dirty_files)
+            knowledge_graph._update_context_statistics()
 
         # 保存更新后的图谱
         if self.memory_manager.save_project(knowledge_graph):
@@ -269,22 +452,95 @@ class SmartIncrementalUpdater:
         else:
             logger.error("❌ 增量更新保存失败")
 
-    def _process_single_file_change(self, knowledge_graph: ProjectKnowledgeGraph, change_info: FileChangeInfo):
-        """处理单个文件的变更"""
+    def _order_changes(self, knowledge_graph: ProjectKnowledgeGraph, changes: Dict[str, FileChangeInfo]) -> List[str]:
+        """按依赖关系对变更文件做拓扑排序（Kahn算法），被依赖的文件排在前面"""
+        # 仅保留变更文件之间的依赖边
+        blockers = {
+            file_path: {
+                dep for dep in knowledge_graph.get_file_dependencies(file_path)
+                if dep in changes and dep != file_path
+            }
+            for file_path in changes
+        }
+        dependents = defaultdict(list)
+        for file_path, deps in blockers.items():
+            for dep in deps:
+                dependents[dep].append(file_path)
+
+        ready = deque(file_path for file_path, deps in blockers.items() if not deps)
+        ordered: List[str] = []
+        while ready:
+            file_path = ready.popleft()
+            ordered.append(file_path)
+            for dependent in dependents[file_path]:
+                blockers[dependent].discard(file_path)
+                if not blockers[dependent]:
+                    ready.append(dependent)
+
+        # 存在循环依赖时，剩余文件按原顺序集中处理
+        if len(ordered) < len(changes):
+            visited = set(ordered)
+            ordered.extend(file_path for file_path in changes if file_path not in visited)
+
+        return ordered
+
+    def _link_importers_of_created(
+        self,
+        knowledge_graph: ProjectKnowledgeGraph,
+        created: Set[str],
+        relinked: Iterable[str],
+        resolve_cache: Dict[tuple, Optional[str]],
+    ):
+        """为未变更的文件补上指向本批新建文件的import边——这些import此前因目标不存在而未能解析"""
+        relinked = set(relinked)
+        # 只有相对导入可能解析到新文件，且模块名需与新文件同名，据此跳过大部分import
+        created_stems = {Path(file_path).stem for file_path in created}
+        for file_path, file_node in knowledge_graph.files.items():
+            if file_path in relinked:
+                continue
+            for import_name in file_node.imports:
+                if not import_name.startswith('.'):
+                    continue
+                if Path(import_name.lstrip('.').rsplit('/', 1)[-1]).stem not in created_stems:
+                    continue
+                target_file = knowledge_graph._resolve_import_cached(import_name, file_path, resolve_cache)
+                if target_file in created:
+                    knowledge_graph.graph.add_edge(file_path, target_file,
+                                                   relation_type='imports',
+                                                   strength=0.8)
+
+    def _detach_file(self, knowledge_graph: ProjectKnowledgeGraph, file_path: str):
+        """移除文件的实体及其在依赖图中的出边，保留其他文件指向它的入边"""
+        entities_to_remove = [
+            name for name, entity in knowledge_graph.entities.items()
+            if entity.file_path == file_path
+        ]
+        for entity_name in entities_to_remove:
+            del knowledge_graph.entities[entity_name]
+
+        graph = knowledge_graph.graph
+        if file_path in graph:
+            graph.remove_nodes_from(
+                [node for node in graph.successors(file_path) if graph.nodes[node].get('node_type') == 'entity']
+            )
+            graph.remove_edges_from(list(graph.out_edges(file_path)))
+
+    def _process_single_file_change(
+        self,
+        knowledge_graph: ProjectKnowledgeGraph,
+        change_info: FileChangeInfo,
+    ) -> Optional[FileNode]:
+        """处理单个文件的变更；新建/修改的文件只登记到 files，
+        返回待链接依赖的节点，由调用方在整批登记完成后统一链接"""
         file_path = change_info.file_path
 
         if change_info.change_type == 'deleted':
-            # 删除文件
+            # 删除文件及相关实体
+            self._detach_file(knowledge_graph, file_path)
             if file_path in knowledge_graph.files:
                 del knowledge_graph.files[file_path]
-
-            # 删除相关实体
-            entities_to_remove = [
-                name for name, entity in knowledge_graph.entities.items()
-                if entity.file_path == file_path
-            ]
-            for entity_name in entities_to_remove:
-                del knowledge_graph.entities[entity_name]
+            if file_path in knowledge_graph.graph:
+                knowledge_graph.graph.remove_node(file_path)
 
         elif change_info.change_type in ['created', 'modified']:
             # 重新分析文件
@@ -298,9 +554,11 @@ class SmartIncrementalUpdater:
                     file_path, old_hash, change_info.new_hash or ""
                 )
 
-                # 重新分析文件（简化版）
-                relative_path = str(Path(file_path).relative_to(self.project_root))
-                knowledge_graph._analyze_single_file(file_path, relative_path)
+                # 重新分析文件；导入依赖待整批登记完成后再链接
+                self._detach_file(knowledge_graph, file_path)
+                new_node = knowledge_graph._analyze_single_file(Path(file_path))
+                if new_node:
+                    knowledge_graph.files[file_path] = new_node
 
                 # 更新Git信息
                 if file_path in knowledge_graph.files and git_info:
@@ -314,15 +572,9 @@ class SmartIncrementalUpdater:
                         change_summary["risk_level"],
                         change_summary.get("lines_changed", 0),
                     )
+                return new_node
 
-    def _update_dependencies(self, knowledge_graph: ProjectKnowledgeGraph, updated_files: Set[str]):
-        """更新受影响文件的依赖关系"""
-        # 重新计算依赖关系（简化版）
-        for file_path in updated_files:
-            if file_path in knowledge_graph.files:
-                file_node = knowledge_graph.files[file_path]
-                # 重新分析导入和导出
-                knowledge_graph._analyze_imports_exports(file_path, file_node)
+        return None
 
     def start_monitoring(self):
         """开始实时监控"""
@@ -332,15 +584,21 @@ class SmartIncrementalUpdater:
 
         logger.info("🔍 开始监控项目: %s", self.project_root)
 
+        self._start_observer(self._observer_candidates)
+
+    def _start_observer(self, candidates):
+        """依次尝试各监控实现，使用第一个启动成功的"""
         event_handler = SmartFileHandler(self)
         observer = None
         last_error: Exception | None = None
 
-        for observer_cls in self._candidate_observers():
+        for observer_cls in candidates:
             candidate = None
             try:
                 candidate = observer_cls()
                 candidate.schedule(event_handler, str(self.project_root), recursive=True)
+                if isinstance(candidate, InotifyObserver):
+                    candidate.on_error = self._on_observer_error
                 candidate.start()
             except Exception as exc:
                 last_error = exc
@@ -363,6 +621,21 @@ class SmartIncrementalUpdater:
         self.monitoring = True
         logger.info("✅ 实时监控已启动（模式: %s）", self._observer_class.__name__)
 
+    def _on_observer_error(self, exc: Exception):
+        """监控线程异常退出：标记监控已停止，并改用后续的监控实现重新启动"""
+        failed = self._observer_class
+        self.monitoring = False
+        self.observer = None
+        candidates = self._observer_candidates
+        fallbacks = candidates[candidates.index(failed) + 1:] if failed in candidates else ()
+        if not fallbacks:
+            logger.error("文件监控已停止: %s", exc)
+            return
+        try:
+            self._start_observer(fallbacks)
+        except RuntimeError as restart_error:
+            logger.error("文件监控已停止: %s", restart_error)
+
     def stop_monitoring(self):
         """停止实时监控"""
         if not self.monitoring or not self.observer:
@@ -2,15 +2,195 @@
 
 from __future__ import annotations
 
+import ast
+import io
 import logging
+import mmap
+import multiprocessing
 import os
+import re
+import threading
+import warnings
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple, Union
+
+try:
+    from tree_sitter import Parser as TSParser
+    from tree_sitter_languages import get_language as get_ts_language
+except ImportError:  # pragma: no cover - 可选依赖
+    TSParser = None
+    get_ts_language = None
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# 超过该大小的文件通过mmap读取，直接在字节视图上扫描
+_MMAP_THRESHOLD = 256 * 1024
+
+# 超过该大小的文件改用流式重复检测，不保留全部行
+_STREAMING_DUPLICATE_THRESHOLD = 4 * 1024 * 1024
+
+Buffer = Union[bytes, mmap.mmap]
+
+# 文件后缀到语言的映射
+SUPPORTED_LANGUAGES = {
+    '.js': 'javascript',
+    '.jsx': 'javascript',
+    '.ts': 'typescript',
+    '.tsx': 'typescript',
+    '.py': 'python',
+    '.java': 'java',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.c': 'c',
+    '.cpp': 'cpp',
+    '.cc': 'cpp',
+    '.cxx': 'cpp'
+}
+
+# 复杂度权重配置
+COMPLEXITY_WEIGHTS = {
+    'if_statement': 1,
+    'while_statement': 1,
+    'for_statement': 1,
+    'switch_statement': 1,
+    'try_statement': 1,
+    'catch_clause': 1,
+    'conditional_expression': 1,
+    'logical_and': 1,
+    'logical_or': 1
+}
+
+# 循环复杂度的分支关键词（按语言）
+_CYCLOMATIC_KEYWORDS = {
+    'python': ('if', 'elif', 'while', 'for', 'try', 'except', 'and', 'or'),
+    'javascript': ('else if', 'if', 'while', 'for', 'switch', 'case', 'try', 'catch', '&&', '||'),
+    'typescript': ('else if', 'if', 'while', 'for', 'switch', 'case', 'try', 'catch', '&&', '||'),
+    'java': ('else if', 'if', 'while', 'for', 'switch', 'case', 'try', 'catch', '&&', '||'),
+}
+
+
+# 函数定义的预编译正则（按语言），匹配真正的定义/签名而非任意关键词子串
+_JS_FUNCTION_RE = re.compile(rb'\bfunction\b[\s*]*[\w$]*\s*\(|(?:\)|\b[\w$]+)\s*=>')
+_FUNCTION_PATTERNS = {
+    'python': re.compile(rb'^\s*(?:async\s+)?def\s+\w+\s*\(', re.MULTILINE),
+    'javascript': _JS_FUNCTION_RE,
+    'typescript': _JS_FUNCTION_RE,
+    # 修饰符后跟可选的返回类型与方法名再接 '('，字段声明不会命中
+    'java': re.compile(rb'\b(?:public|private|protected)\s+(?:[\w<>\[\],?.]+\s+)*?\w+\s*\('),
+}
+
+# 类定义的字面量模式（按语言）
+_CLASS_PATTERNS = {
+    'python': ('class ',),
+    'javascript': ('class ',),
+    'typescript': ('class ', 'interface '),
+    'java': ('class ', 'interface ', 'enum '),
+}
+
+# 逐行扫描使用的关键词（子串匹配），预编译为单个正则
+_NEST_START_RE = re.compile(rb'if|for|while|try')
+_DEPTH_START_RE = re.compile(rb'if|for|while|try|def|class')
+_NEST_CLOSERS = frozenset({b'}', b'end', b'endif'})
+_DEPTH_CLOSERS = frozenset({b'}', b'end'})
+_JS_LANGUAGES = frozenset({'javascript', 'typescript'})
+
+
+# tree-sitter 节点类型（按语法名）：函数、类、分支
+_TS_FUNCTION_NODES = {
+    'javascript': frozenset({'function_declaration', 'function_expression', 'function', 'generator_function_declaration', 'arrow_function', 'method_definition'}),
+    'java': frozenset({'method_declaration', 'constructor_declaration', 'lambda_expression'}),
+    'go': frozenset({'function_declaration', 'method_declaration', 'func_literal'}),
+    'rust': frozenset({'function_item', 'closure_expression'}),
+    'c': frozenset({'function_definition'}),
+    'cpp': frozenset({'function_definition', 'lambda_expression'}),
+}
+_TS_FUNCTION_NODES['typescript'] = _TS_FUNCTION_NODES['tsx'] = _TS_FUNCTION_NODES['javascript']
+
+_TS_CLASS_NODES = {
+    'javascript': frozenset({'class_declaration', 'class'}),
+    'typescript': frozenset({'class_declaration', 'abstract_class_declaration', 'class', 'interface_declaration'}),
+    'java': frozenset({'class_declaration', 'interface_declaration', 'enum_declaration', 'record_declaration'}),
+    'go': frozenset({'struct_type', 'interface_type'}),
+    'rust': frozenset({'struct_item', 'enum_item', 'trait_item'}),
+    'c': frozenset({'struct_specifier'}),
+    'cpp': frozenset({'struct_specifier', 'class_specifier'}),
+}
+_TS_CLASS_NODES['tsx'] = _TS_CLASS_NODES['typescript']
+
+_TS_BRANCH_NODES = {
+    'javascript': frozenset({'if_statement', 'while_statement', 'do_statement', 'for_statement', 'for_in_statement', 'switch_case', 'catch_clause', 'ternary_expression'}),
+    'java': frozenset({'if_statement', 'while_statement', 'do_statement', 'for_statement', 'enhanced_for_statement', 'switch_label', 'catch_clause', 'ternary_expression'}),
+    'go': frozenset({'if_statement', 'for_statement', 'expression_case', 'type_case', 'communication_case'}),
+    'rust': frozenset({'if_expression', 'while_expression', 'loop_expression', 'for_expression', 'match_arm'}),
+    'c': frozenset({'if_statement', 'while_statement', 'do_statement', 'for_statement', 'case_statement', 'conditional_expression'}),
+    'cpp': frozenset({'if_statement', 'while_statement', 'do_statement', 'for_statement', 'for_range_loop', 'case_statement', 'catch_clause', 'conditional_expression'}),
+}
+_TS_BRANCH_NODES['typescript'] = _TS_BRANCH_NODES['tsx'] = _TS_BRANCH_NODES['javascript']
+_TS_LOGICAL_OPERATORS = frozenset({'&&', '||'})
+
+# 每个线程按语法名复用一个 Parser 实例，避免逐文件分配
+_PARSERS = threading.local()
+_UNAVAILABLE_GRAMMARS: set = set()
+
+
+def _ts_parser(grammar: str):
+    """获取当前线程的 tree-sitter 解析器；依赖或语法不可用时返回None"""
+    if TSParser is None or grammar in _UNAVAILABLE_GRAMMARS:
+        return None
+    parser = getattr(_PARSERS, grammar, None)
+    if parser is None:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', FutureWarning)
+                language = get_ts_language(grammar)
+            parser = TSParser()
+            parser.set_language(language)
+        except Exception as e:
+            logger.debug("tree-sitter 语法不可用 %s: %s", grammar, e)
+            _UNAVAILABLE_GRAMMARS.add(grammar)
+            return None
+        setattr(_PARSERS, grammar, parser)
+    return parser
+
+
+@lru_cache(maxsize=None)
+def _cyclomatic_pattern(language: str) -> Optional[Pattern[bytes]]:
+    """将语言的分支关键词编译为单个交替正则，单词按词边界匹配，运算符按字面匹配"""
+    keywords = _CYCLOMATIC_KEYWORDS.get(language)
+    if not keywords:
+        return None
+
+    alternatives = []
+    for keyword in keywords:
+        if keyword[0].isalpha():
+            alternatives.append(r'\b' + r'\s+'.join(map(re.escape, keyword.split())) + r'\b')
+        else:
+            alternatives.append(re.escape(keyword))
+    return re.compile('|'.join(alternatives).encode())
+
+
+@lru_cache(maxsize=None)
+def _literal_pattern(literal: str) -> Pattern[bytes]:
+    return re.compile(re.escape(literal.encode()))
+
+
+def _iter_lines(content: Buffer) -> Iterator[bytes]:
+    """逐行惰性产出字节行（不解码、不构造完整的行列表），仅以 b'\\n' 断行"""
+    if isinstance(content, mmap.mmap):
+        content.seek(0)
+        lines = iter(content.readline, b'')
+    else:
+        lines = io.BytesIO(content)
+    for raw in lines:
+        yield raw.rstrip(b'\n')
+
+@dataclass(slots=True, frozen=True)
 class CodeMetrics:
     """代码质量指标"""
     file_path: str
@@ -21,12 +201,12 @@ class CodeMetrics:
     function_count: int
     class_count: int
     max_nesting_depth: int
-    long_functions: List[str]  # 超过50行的函数
-    duplicated_code_blocks: List[str]
+    long_functions: List[Tuple[str, int]]  # 超过50行的函数: (函数名, 行数)
+    duplicated_code_blocks: List[Tuple[int, int, int, int]]  # (起始行, 结束行, 重复处起始行, 重复处结束行)
     maintainability_index: float  # 0-100
     technical_debt_minutes: int
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QualityIssue:
     """质量问题"""
     file_path: str
@@ -38,267 +218,458 @@ class QualityIssue:
     suggestion: str
     auto_fixable: bool
 
+@dataclass
+class ScanResult:
+    """逐行扫描的聚合结果"""
+    lines_of_code: int
+    cognitive_complexity: int
+    max_nesting_depth: int
+    long_functions: List[Tuple[str, int]]
+    nonblank_lines: List[bytes]  # 去除首尾空白后的非空行，供重复代码检测
+
+class _PythonMetricsVisitor(ast.NodeVisitor):
+    """单次遍历Python AST，精确统计分支、嵌套深度、函数与类"""
+
+    def __init__(self):
+        self.branches = 0
+        self.cognitive = 0
+        self.depth = 0  # 控制流与定义块的嵌套深度
+        self.max_depth = 0
+        self.control_depth = 0  # 仅控制流的嵌套深度，用于认知复杂度
+        self.function_count = 0
+        self.class_count = 0
+        self.long_functions: List[Tuple[str, int]] = []
+
+    def _enter(self, control: bool):
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+        if control:
+            self.control_depth += 1
+
+    def _exit(self, control: bool):
+        self.depth -= 1
+        if control:
+            self.control_depth -= 1
+
+    def _visit_control(self, node: ast.AST):
+        self.branches += 1
+        self.cognitive += self.control_depth + 1  # 嵌套越深，认知负担越重
+        self._enter(control=True)
+        self.generic_visit(node)
+        self._exit(control=True)
+
+    visit_For = visit_AsyncFor = visit_While = visit_Try = _visit_control
+    if hasattr(ast, 'TryStar'):
+        visit_TryStar = _visit_control
+
+    def visit_If(self, node: ast.If, is_elif: bool = False):
+        self.branches += 1
+        self.cognitive += 1 if is_elif else self.control_depth + 1
+        self._enter(control=True)
+        self.visit(node.test)
+        for stmt in node.body:
+            self.visit(stmt)
+        # elif 与 if 处于同一层级
+        is_chain = len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If)
+        if not is_chain:
+            for stmt in node.orelse:
+                self.visit(stmt)
+        self._exit(control=True)
+        if is_chain:
+            self.visit_If(node.orelse[0], is_elif=True)
+
+    def _visit_function(self, node: ast.AST):
+        self.function_count += 1
+        length = node.end_lineno - node.lineno
+        if length > 50:
+            self.long_functions.append((node.name, length))
+        self._enter(control=False)
+        self.generic_visit(node)
+        self._exit(control=False)
+
+    visit_FunctionDef = visit_AsyncFunctionDef = _visit_function
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.class_count += 1
+        self._enter(control=False)
+        self.generic_visit(node)
+        self._exit(control=False)
+
+    def visit_BoolOp(self, node: ast.BoolOp):
+        self.branches += len(node.values) - 1
+        self.generic_visit(node)
+
+    def visit_IfExp(self, node: ast.IfExp):
+        self.branches += 1
+        self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        self.branches += 1
+        self.generic_visit(node)
+
+    def visit_comprehension(self, node: ast.comprehension):
+        self.branches += 1 + len(node.ifs)
+        self.generic_visit(node)
+
 class TreeSitterParser:
     """Tree-sitter AST解析器"""
     
+    # 语言与权重表为模块级常量，实例之间共享
+    supported_languages = SUPPORTED_LANGUAGES
+    complexity_weights = COMPLEXITY_WEIGHTS
+    
     def __init__(self):
-        self.supported_languages = {
-            '.js': 'javascript',
-            '.jsx': 'javascript', 
-            '.ts': 'typescript',
-            '.tsx': 'typescript',
-            '.py': 'python',
-            '.java': 'java',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.c': 'c',
-            '.cpp': 'cpp',
-            '.cc': 'cpp',
-            '.cxx': 'cpp'
-        }
+        # 按 (路径, mtime_ns, 大小) 缓存解析结果，未变更的文件无需重新读取
+        self._metrics_cache: OrderedDict[Tuple[str, int, int], CodeMetrics] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.max_cache_entries = 4096
         
-        # 复杂度权重配置
-        self.complexity_weights = {
-            'if_statement': 1,
-            'while_statement': 1, 
-            'for_statement': 1,
-            'switch_statement': 1,
-            'try_statement': 1,
-            'catch_clause': 1,
-            'conditional_expression': 1,
-            'logical_and': 1,
-            'logical_or': 1
-        }
+        # 关闭重复代码检测（超大文件或只需结构指标时的快速模式）
+        self.skip_duplicate_detection = False
+    
+    def __getstate__(self) -> Dict:
+        # 发送到子进程时不携带锁和缓存，子进程各自重建
+        state = self.__dict__.copy()
+        del state['_cache_lock']
+        state['_metrics_cache'] = OrderedDict()
+        return state
+    
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._cache_lock = threading.Lock()
     
-    def detect_language(self, file_path: str) -> Optional[str]:
+    @staticmethod
+    def detect_language(file_path: str) -> Optional[str]:
         """检测文件语言"""
-        suffix = Path(file_path).suffix.lower()
-        return self.supported_languages.get(suffix)
+        return SUPPORTED_LANGUAGES.get(Path(file_path).suffix.lower())
     
     def parse_file(self, file_path: str) -> Optional[CodeMetrics]:
         """解析单个文件"""
-        if not os.path.exists(file_path):
-            return None
-            
         language = self.detect_language(file_path)
         if not language:
             return None
+        
+        # EAFP：一次stat同时完成存在性检查与缓存键构造
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
             
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            return self._analyze_code(file_path, content, language)
+            cache_key = (file_path, stat.st_mtime_ns, stat.st_size)
+            with self._cache_lock:
+                cached = self._metrics_cache.get(cache_key)
+                if cached is not None:
+                    self._metrics_cache.move_to_end(cache_key)
+                    return cached
+            
+            with open(file_path, 'rb') as f:
+                if stat.st_size > _MMAP_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        metrics = self._analyze_code(file_path, mm, language)
+                else:
+                    metrics = self._analyze_code(file_path, f.read(), language)
+            
+            # 多个线程可能并发解析（如并行评分），LRU 的读写需加锁
+            with self._cache_lock:
+                self._metrics_cache[cache_key] = metrics
+                if len(self._metrics_cache) > self.max_cache_entries:
+                    self._metrics_cache.popitem(last=False)
+            return metrics
             
         except Exception as e:
             logger.warning("解析文件失败 %s: %s", file_path, e)
             return None
     
-    def _analyze_code(self, file_path: str, content: str, language: str) -> CodeMetrics:
-        """分析代码内容"""
-        lines = content.split('\n')
-        loc = len([line for line in lines if line.strip() and not line.strip().startswith('#')])
+    def _analyze_code(self, file_path: str, content: Buffer, language: str) -> CodeMetrics:
+        """分析代码内容；关键词均为ASCII，计数直接在字节上进行"""
+        python_metrics = self._analyze_python_ast(content) if language == 'python' else None
+        streaming = len(content) > _STREAMING_DUPLICATE_THRESHOLD
+        
+        if python_metrics is None:
+            scan = self._scan_lines(_iter_lines(content), language, collect_lines=not streaming)
+            loc = scan.lines_of_code
+            nonblank_lines = scan.nonblank_lines
+            cognitive = scan.cognitive_complexity
+            max_depth = scan.max_nesting_depth
+            long_functions = scan.long_functions
+            structure = None if language == 'python' else self._analyze_tree_sitter(file_path, content, language)
+            if structure is None:
+                cyclomatic = self._calculate_cyclomatic_complexity(content, language)
+                function_count = self._count_functions(content, language)
+                class_count = self._count_classes(content, language)
+            else:
+                cyclomatic, function_count, class_count = structure
+        else:
+            loc, nonblank_lines = self._count_lines(_iter_lines(content), collect_lines=not streaming)
+            cyclomatic = python_metrics['cyclomatic_complexity']
+            cognitive = python_metrics['cognitive_complexity']
+            max_depth = python_metrics['max_nesting_depth']
+            long_functions = python_metrics['long_functions']
+            function_count = python_metrics['function_count']
+            class_count = python_metrics['class_count']
         
-        # 基础指标计算
-        metrics = CodeMetrics(
+        if streaming:
+            duplicates = self._find_duplicated_code_streaming(_iter_lines(content))
+        else:
+            duplicates = self._find_duplicated_code(nonblank_lines)
+        
+        # 维护性指数 (0-100, 100最好)：Microsoft维护性指数公式的简化版本
+        penalty = (
+            loc * 0.23              # 代码量惩罚
+            + cyclomatic * 3.2      # 复杂度惩罚
+            + cognitive * 2.5       # 认知复杂度惩罚
+            + len(long_functions) * 5
+            + len(duplicates) * 10
+        )
+        maintainability_index = min(100, max(0, 100 - penalty))
+        
+        # 技术债务 (分钟)：复杂度、长函数、重复代码、嵌套深度
+        technical_debt = len(long_functions) * 30 + len(duplicates) * 45
+        if cyclomatic > 10:
+            technical_debt += (cyclomatic - 10) * 15
+        if max_depth > 4:
+            technical_debt += (max_depth - 4) * 20
+        
+        return CodeMetrics(
             file_path=file_path,
             language=language,
             lines_of_code=loc,
-            cyclomatic_complexity=self._calculate_cyclomatic_complexity(content, language),
-            cognitive_complexity=self._calculate_cognitive_complexity(content, language),
-            function_count=self._count_functions(content, language),
-            class_count=self._count_classes(content, language),
-            max_nesting_depth=self._calculate_max_nesting_depth(content, language),
-            long_functions=self._find_long_functions(content, language),
-            duplicated_code_blocks=self._find_duplicated_code(content),
-            maintainability_index=0.0,  # 后续计算
-            technical_debt_minutes=0    # 后续计算
+            cyclomatic_complexity=cyclomatic,
+            cognitive_complexity=cognitive,
+            function_count=function_count,
+            class_count=class_count,
+            max_nesting_depth=max_depth,
+            long_functions=long_functions,
+            duplicated_code_blocks=duplicates,
+            maintainability_index=maintainability_index,
+            technical_debt_minutes=technical_debt,
         )
+    
+    def _analyze_python_ast(self, content: Buffer) -> Optional[dict]:
+        """使用标准库ast一次遍历统计Python文件的结构指标，语法错误时返回None"""
+        source = content[:] if isinstance(content, mmap.mmap) else content
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            return None
         
-        # 计算维护性指数
-        metrics.maintainability_index = self._calculate_maintainability_index(metrics)
+        visitor = _PythonMetricsVisitor()
+        visitor.visit(tree)
+        return {
+            'cyclomatic_complexity': min(1 + visitor.branches, 50),
+            'cognitive_complexity': min(visitor.cognitive, 100),
+            'max_nesting_depth': visitor.max_depth,
+            'long_functions': visitor.long_functions,
+            'function_count': visitor.function_count,
+            'class_count': visitor.class_count,
+        }
+    
+    def _analyze_tree_sitter(self, file_path: str, content: Buffer, language: str) -> Optional[Tuple[int, int, int]]:
+        """使用tree-sitter语法树统计 (循环复杂度, 函数数, 类数)；不可用时返回None"""
+        grammar = 'tsx' if file_path.endswith('.tsx') else language
+        parser = _ts_parser(grammar)
+        if parser is None:
+            return None
+        
+        source = content[:] if isinstance(content, mmap.mmap) else content
+        try:
+            tree = parser.parse(source)
+        finally:
+            parser.reset()
         
-        # 计算技术债务
-        metrics.technical_debt_minutes = self._calculate_technical_debt(metrics)
+        function_nodes = _TS_FUNCTION_NODES[grammar]
+        class_nodes = _TS_CLASS_NODES[grammar]
+        branch_nodes = _TS_BRANCH_NODES[grammar]
+        branches = functions = classes = 0
+        
+        # 游标先序遍历整棵树，避免为每个子节点创建Python对象
+        cursor = tree.walk()
+        while True:
+            node = cursor.node
+            node_type = node.type
+            if not node.is_named:
+                # 匿名节点是关键字/运算符记号，仅逻辑运算符计入分支
+                if node_type in _TS_LOGICAL_OPERATORS and node.parent.type == 'binary_expression':
+                    branches += 1
+            elif node_type in branch_nodes:
+                branches += 1
+            elif node_type in function_nodes:
+                functions += 1
+            elif node_type in class_nodes:
+                # C/C++ 的结构体引用也是同类节点，仅统计带定义体的
+                if language not in ('c', 'cpp') or node.child_by_field_name('body') is not None:
+                    classes += 1
+            
+            if cursor.goto_first_child() or cursor.goto_next_sibling():
+                continue
+            while cursor.goto_parent():
+                if cursor.goto_next_sibling():
+                    break
+            else:
+                break
         
-        return metrics
+        return min(1 + branches, 50), functions, classes
     
-    def _calculate_cyclomatic_complexity(self, content: str, language: str) -> int:
+    def _calculate_cyclomatic_complexity(self, content: Buffer, language: str) -> int:
         """计算循环复杂度"""
         complexity = 1  # 基础复杂度
         
-        # 简化版本：基于关键词计数
-        complexity_keywords = {
-            'python': ['if', 'elif', 'while', 'for', 'try', 'except', 'and', 'or'],
-            'javascript': ['if', 'else if', 'while', 'for', 'switch', 'case', 'try', 'catch', '&&', '||'],
-            'typescript': ['if', 'else if', 'while', 'for', 'switch', 'case', 'try', 'catch', '&&', '||'],
-            'java': ['if', 'else if', 'while', 'for', 'switch', 'case', 'try', 'catch', '&&', '||']
-        }
-        
-        keywords = complexity_keywords.get(language, [])
-        for keyword in keywords:
-            complexity += content.count(keyword)
+        # 基于关键词计数：单次正则扫描，按词边界避免 elif/identifier 等误计
+        pattern = _cyclomatic_pattern(language)
+        if pattern is not None:
+            complexity += len(pattern.findall(content))
             
         return min(complexity, 50)  # 最大复杂度限制
     
-    def _calculate_cognitive_complexity(self, content: str, language: str) -> int:
-        """计算认知复杂度 (更注重人类理解难度)"""
-        cognitive = 0
-        nesting_level = 0
-        
-        lines = content.split('\n')
+    def _count_functions(self, content: Buffer, language: str) -> int:
+        """统计函数数量"""
+        pattern = _FUNCTION_PATTERNS.get(language)
+        return len(pattern.findall(content)) if pattern is not None else 0
+    
+    def _count_classes(self, content: Buffer, language: str) -> int:
+        """统计类数量"""
+        return sum(
+            len(_literal_pattern(pattern).findall(content))
+            for pattern in _CLASS_PATTERNS.get(language, ())
+        )
+    
+    def _count_lines(self, lines: Iterator[bytes], collect_lines: bool = True) -> Tuple[int, List[bytes]]:
+        """统计代码行数（跳过空行和#注释），并按需收集去除首尾空白后的非空行"""
+        loc = 0
+        nonblank_lines = []
         for line in lines:
             stripped = line.strip()
-            
-            # 计算嵌套层级
-            if any(keyword in stripped for keyword in ['if', 'for', 'while', 'try']):
-                if stripped.endswith(':') or stripped.endswith('{'):
-                    nesting_level += 1
-                    cognitive += nesting_level  # 嵌套越深，认知负担越重
-                    
-            # 减少嵌套层级
-            if stripped in ['}', 'end', 'endif'] or stripped.startswith('except'):
-                nesting_level = max(0, nesting_level - 1)
-                
-        return min(cognitive, 100)
+            if stripped:
+                if collect_lines:
+                    nonblank_lines.append(stripped)
+                if not stripped.startswith(b'#'):
+                    loc += 1
+        return loc, nonblank_lines
     
-    def _count_functions(self, content: str, language: str) -> int:
-        """统计函数数量"""
-        function_patterns = {
-            'python': ['def ', 'async def '],
-            'javascript': ['function ', '=> ', 'async function'],
-            'typescript': ['function ', '=> ', 'async function'],
-            'java': ['public ', 'private ', 'protected '],
-        }
+    def _scan_lines(self, lines: Iterator[bytes], language: str, collect_lines: bool = True) -> ScanResult:
+        """单次遍历所有行，同时统计代码行数、认知复杂度、最大嵌套深度和长函数"""
+        loc = 0
         
-        patterns = function_patterns.get(language, [])
-        count = 0
-        for pattern in patterns:
-            count += content.count(pattern)
-            
-        return count
-    
-    def _count_classes(self, content: str, language: str) -> int:
-        """统计类数量"""
-        class_patterns = {
-            'python': ['class '],
-            'javascript': ['class '],
-            'typescript': ['class ', 'interface '],
-            'java': ['class ', 'interface ', 'enum ']
-        }
+        # 认知复杂度 (更注重人类理解难度)
+        cognitive = 0
+        nesting_level = 0
         
-        patterns = class_patterns.get(language, [])
-        count = 0
-        for pattern in patterns:
-            count += content.count(pattern)
-            
-        return count
-    
-    def _calculate_max_nesting_depth(self, content: str, language: str) -> int:
-        """计算最大嵌套深度"""
+        # 最大嵌套深度
         max_depth = 0
         current_depth = 0
         
-        lines = content.split('\n')
-        for line in lines:
-            stripped = line.strip()
-            
-            # 增加深度的模式
-            if any(keyword in stripped for keyword in ['if', 'for', 'while', 'try', 'def', 'class']):
-                if stripped.endswith(':') or stripped.endswith('{'):
-                    current_depth += 1
-                    max_depth = max(max_depth, current_depth)
-                    
-            # 减少深度的模式  
-            elif stripped in ['}', 'end'] or (language == 'python' and len(line) - len(line.lstrip()) < 4):
-                current_depth = max(0, current_depth - 1)
-                
-        return max_depth
-    
-    def _find_long_functions(self, content: str, language: str) -> List[str]:
-        """找出长函数 (>50行)"""
+        # 长函数 (>50行)
         long_functions = []
-        lines = content.split('\n')
         current_function = None
         function_start = 0
         
+        nonblank_lines = []
+        
         for i, line in enumerate(lines):
             stripped = line.strip()
+            opens_block = stripped.endswith((b':', b'{'))
+            
+            # 代码行数（跳过空行和#注释）
+            if stripped:
+                if collect_lines:
+                    nonblank_lines.append(stripped)
+                if not stripped.startswith(b'#'):
+                    loc += 1
+            
+            # 认知复杂度：嵌套越深，认知负担越重
+            if opens_block and _NEST_START_RE.search(stripped):
+                nesting_level += 1
+                cognitive += nesting_level
+            if stripped in _NEST_CLOSERS or stripped.startswith(b'except'):
+                nesting_level = max(0, nesting_level - 1)
+            
+            # 嵌套深度
+            if _DEPTH_START_RE.search(stripped):
+                if opens_block:
+                    current_depth += 1
+                    max_depth = max(max_depth, current_depth)
+            elif stripped in _DEPTH_CLOSERS or (language == 'python' and len(line) - len(line.lstrip()) < 4):
+                current_depth = max(0, current_depth - 1)
             
             # 检测函数开始
-            if language == 'python' and stripped.startswith('def '):
+            if language == 'python' and stripped.startswith(b'def '):
                 if current_function and (i - function_start) > 50:
-                    long_functions.append(f"{current_function} ({i - function_start} lines)")
-                current_function = stripped.split('(')[0].replace('def ', '')
+                    long_functions.append((current_function, i - function_start))
+                current_function = stripped.split(b'(')[0].replace(b'def ', b'').decode('utf-8', 'replace')
                 function_start = i
                 
-            elif language in ['javascript', 'typescript'] and 'function ' in stripped:
+            elif language in _JS_LANGUAGES and b'function ' in stripped:
                 if current_function and (i - function_start) > 50:
-                    long_functions.append(f"{current_function} ({i - function_start} lines)")
+                    long_functions.append((current_function, i - function_start))
                 current_function = self._extract_function_name(stripped)
                 function_start = i
-                
-        return long_functions
+        
+        return ScanResult(
+            lines_of_code=loc,
+            cognitive_complexity=min(cognitive, 100),
+            max_nesting_depth=max_depth,
+            long_functions=long_functions,
+            nonblank_lines=nonblank_lines,
+        )
     
-    def _extract_function_name(self, line: str) -> str:
-        """提取函数名"""
-        if 'function ' in line:
-            parts = line.split('function ')[1].split('(')[0].strip()
-            return parts
+    def _extract_function_name(self, line: bytes) -> str:
+        """提取函数名，仅解码名称片段"""
+        if b'function ' in line:
+            return line.split(b'function ')[1].split(b'(')[0].strip().decode('utf-8', 'replace')
         return "anonymous"
     
-    def _find_duplicated_code(self, content: str) -> List[str]:
-        """检测重复代码块 (简化版)"""
-        duplicates = []
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
-        
-        # 查找连续相同的代码块 (>3行)
-        for i in range(len(lines) - 3):
-            block = lines[i:i+3]
-            for j in range(i+3, len(lines) - 2):
-                if lines[j:j+3] == block:
-                    duplicates.append(f"Lines {i+1}-{i+3} duplicated at {j+1}-{j+3}")
-                    
-        return duplicates[:5]  # 限制数量
-    
-    def _calculate_maintainability_index(self, metrics: CodeMetrics) -> float:
-        """计算维护性指数 (0-100, 100最好)"""
-        # Microsoft维护性指数公式的简化版本
-        volume = metrics.lines_of_code * 0.23  # 代码量惩罚
-        complexity_penalty = metrics.cyclomatic_complexity * 3.2
-        cognitive_penalty = metrics.cognitive_complexity * 2.5
+    def _find_duplicated_code(self, lines: List[bytes]) -> List[Tuple[int, int, int, int]]:
+        """检测重复代码块 (简化版)，``lines`` 为去除首尾空白后的非空行"""
+        # 至少需要6行才可能出现两个不重叠的3行块
+        if self.skip_duplicate_detection or len(lines) < 6:
+            return []
         
-        base_score = 100
-        penalty = volume + complexity_penalty + cognitive_penalty
+        duplicates = []
         
-        if metrics.long_functions:
-            penalty += len(metrics.long_functions) * 5
-            
-        if metrics.duplicated_code_blocks:
-            penalty += len(metrics.duplicated_code_blocks) * 10
-            
-        score = max(0, base_score - penalty)
-        return min(100, score)
-    
-    def _calculate_technical_debt(self, metrics: CodeMetrics) -> int:
-        """计算技术债务 (分钟)"""
-        debt = 0
+        # 查找连续相同的代码块 (>3行)：先按3行窗口建立哈希索引，
+        # 再只在相同窗口的出现位置之间配对，避免两两比较
+        windows = list(zip(lines, lines[1:], lines[2:]))
+        positions = defaultdict(list)
+        for start, window in enumerate(windows):
+            positions[window].append(start)
         
-        # 复杂度债务
-        if metrics.cyclomatic_complexity > 10:
-            debt += (metrics.cyclomatic_complexity - 10) * 15
-            
-        # 长函数债务
-        debt += len(metrics.long_functions) * 30
+        for i, window in enumerate(windows):
+            starts = positions[window]
+            if len(starts) < 2:
+                continue
+            for j in starts[bisect_left(starts, i + 3):]:
+                duplicates.append((i + 1, i + 3, j + 1, j + 3))
+                if len(duplicates) == 5:  # 限制数量
+                    return duplicates
+                    
+        return duplicates
+
+    def _find_duplicated_code_streaming(self, lines: Iterator[bytes]) -> List[Tuple[int, int, int, int]]:
+        """超大文件的流式重复检测：只保留3行窗口哈希到首次出现位置的映射，
+        按出现顺序报告与首次出现不重叠的重复块"""
+        if self.skip_duplicate_detection:
+            return []
         
-        # 重复代码债务
-        debt += len(metrics.duplicated_code_blocks) * 45
+        duplicates = []
+        first_seen: Dict[int, int] = {}
+        window: deque = deque(maxlen=3)
+        index = 0
+        for line in lines:
+            stripped = line.strip()
+            if not stripped:
+                continue
+            window.append(stripped)
+            if len(window) == 3:
+                start = index - 2
+                first = first_seen.setdefault(hash(tuple(window)), start)
+                if start - first >= 3:
+                    duplicates.append((first + 1, first + 3, start + 1, start + 3))
+                    if len(duplicates) == 5:  # 限制数量
+                        return duplicates
+            index += 1
         
-        # 嵌套深度债务
-        if metrics.max_nesting_depth > 4:
-            debt += (metrics.max_nesting_depth - 4) * 20
-            
-        return debt
+        return duplicates
 
 class QualityAnalyzer:
     """代码质量分析器"""
@@ -316,73 +687,80 @@ class QualityAnalyzer:
             issues = self._generate_quality_issues(metrics)
             
         return metrics, issues
+
+    def analyze_files(
+        self,
+        file_paths: List[str],
+        max_workers: Optional[int] = None,
+        chunksize: int = 32,
+    ) -> List[Tuple[Optional[CodeMetrics], List[QualityIssue]]]:
+        """使用进程池并行分析多个文件，结果顺序与输入一致"""
+        workers = max_workers or os.cpu_count() or 1
+        if len(file_paths) <= 1 or workers == 1:
+            return [self.analyze_file(path) for path in file_paths]
+
+        try:
+            # spawn：避免在多线程进程中fork
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                return list(executor.map(self.analyze_file, file_paths, chunksize=chunksize))
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning("进程池不可用，改为串行分析: %s", e)
+            return [self.analyze_file(path) for path in file_paths]
     
     def _generate_quality_issues(self, metrics: CodeMetrics) -> List[QualityIssue]:
         """基于指标生成质量问题"""
         issues = []
+        # 指标级问题统一定位到文件首行
+        make_issue = partial(QualityIssue, file_path=metrics.file_path, line=1, column=1, auto_fixable=False)
         
         # 复杂度问题
         if metrics.cyclomatic_complexity > 15:
-            issues.append(QualityIssue(
-                file_path=metrics.file_path,
-                line=1,
-                column=1,
+            issues.append(make_issue(
                 severity='warning',
                 category='complexity',
                 message=f'Cyclomatic complexity is {metrics.cyclomatic_complexity} (threshold: 15)',
-                suggestion='Consider breaking down large functions into smaller ones',
-                auto_fixable=False
+                suggestion='Consider breaking down large functions into smaller ones'
             ))
             
         if metrics.cognitive_complexity > 25:
-            issues.append(QualityIssue(
-                file_path=metrics.file_path,
-                line=1,
-                column=1,
+            issues.append(make_issue(
                 severity='warning',
                 category='complexity', 
                 message=f'Cognitive complexity is {metrics.cognitive_complexity} (threshold: 25)',
-                suggestion='Reduce nesting depth and simplify logic flow',
-                auto_fixable=False
+                suggestion='Reduce nesting depth and simplify logic flow'
             ))
             
         # 长函数问题
-        for long_func in metrics.long_functions:
-            issues.append(QualityIssue(
-                file_path=metrics.file_path,
-                line=1,
-                column=1,
+        issues.extend(
+            make_issue(
                 severity='info',
                 category='style',
-                message=f'Long function detected: {long_func}',
-                suggestion='Consider extracting smaller functions for better readability',
-                auto_fixable=False
-            ))
+                message=f'Long function detected: {name} ({length} lines)',
+                suggestion='Consider extracting smaller functions for better readability'
+            )
+            for name, length in metrics.long_functions
+        )
             
         # 重复代码问题
-        for duplicate in metrics.duplicated_code_blocks:
-            issues.append(QualityIssue(
-                file_path=metrics.file_path,
-                line=1,
-                column=1,
+        issues.extend(
+            make_issue(
                 severity='warning',
                 category='style',
-                message=f'Duplicated code: {duplicate}',
-                suggestion='Extract common code into reusable functions',
-                auto_fixable=False
-            ))
+                message=f'Duplicated code: Lines {start}-{end} duplicated at {dup_start}-{dup_end}',
+                suggestion='Extract common code into reusable functions'
+            )
+            for start, end, dup_start, dup_end in metrics.duplicated_code_blocks
+        )
             
         # 维护性问题
         if metrics.maintainability_index < 30:
-            issues.append(QualityIssue(
-                file_path=metrics.file_path,
-                line=1,
-                column=1,
+            issues.append(make_issue(
                 severity='error',
                 category='maintainability',
                 message=f'Low maintainability index: {metrics.maintainability_index:.1f}',
-                suggestion='Refactor to improve code structure and reduce complexity',
-                auto_fixable=False
+                suggestion='Refactor to improve code structure and reduce complexity'
             ))
             
         return issues
@@ -3,15 +3,62 @@
 from __future__ import annotations
 
 import logging
+import os
+import re
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
+from functools import lru_cache
 from enum import Enum
-from typing import Dict, List, Optional
+from itertools import islice
+from operator import mul
+from typing import Dict, List, Optional, Tuple
 
 from .ast_parser import CodeMetrics, QualityIssue
 from .static_analyzers import StaticAnalysisResult
 
 logger = logging.getLogger(__name__)
 
+# Bandit高风险规则
+_HIGH_RISK_RULES = frozenset({'B601', 'B602', 'B301'})
+
+# 自带静态类型的语言
+_TYPED_LANGUAGES = frozenset({'typescript', 'java', 'rust', 'go'})
+
+# 结果消息中提及类型（不区分大小写），避免逐条 lower() 分配新字符串
+_TYPE_RE = re.compile(r'type', re.IGNORECASE)
+
+# 分钟到小时的换算系数
+_INV_60 = 1.0 / 60.0
+
+# 等级分界（下限，含）与对应等级
+_GRADE_BOUNDS = (60.0, 70.0, 80.0, 90.0, 95.0)
+_GRADES = ('F', 'D', 'C', 'B', 'A', 'A+')
+
+def _clamp(value: float, low: float = 0.0, high: float = 100.0) -> float:
+    """将评分限制在 [low, high] 区间"""
+    return low if value < low else high if value > high else value
+
+@lru_cache(maxsize=4096)
+def _estimate_mi(cyclomatic: int, cognitive: int, lines_of_code: int, long_functions: int, duplicates: int) -> float:
+    """简化的维护性指数估算；只依赖五个整数，重复评分相同指标时直接命中缓存"""
+    base_score = 100
+    
+    # 复杂度惩罚
+    complexity_penalty = cyclomatic * 2
+    cognitive_penalty = cognitive * 1.5
+    
+    # 代码量惩罚
+    loc_penalty = max(0, (lines_of_code - 100) * 0.1)
+    
+    # 结构问题惩罚
+    structure_penalty = long_functions * 5 + duplicates * 8
+    
+    score = base_score - complexity_penalty - cognitive_penalty - loc_penalty - structure_penalty
+    return _clamp(score)
+
 class QualityCategory(Enum):
     """质量分类"""
     MAINTAINABILITY = "maintainability"
@@ -21,7 +68,11 @@ class QualityCategory(Enum):
     STYLE = "style"
     COMPLEXITY = "complexity"
 
-@dataclass
+# 分类评分列表的固定顺序（与枚举定义顺序一致）
+_CATEGORY_ORDER = tuple(QualityCategory)
+_EXCELLENT_LABELS = tuple(f"Excellent {category.value}" for category in _CATEGORY_ORDER)
+
+@dataclass(slots=True)
 class QualityScore:
     """质量评分详情"""
     total_score: float  # 总分 0-100
@@ -34,20 +85,9 @@ class QualityScore:
     
     def __post_init__(self):
         """计算等级"""
-        if self.total_score >= 95:
-            self.grade = "A+"
-        elif self.total_score >= 90:
-            self.grade = "A"
-        elif self.total_score >= 80:
-            self.grade = "B"
-        elif self.total_score >= 70:
-            self.grade = "C"
-        elif self.total_score >= 60:
-            self.grade = "D"
-        else:
-            self.grade = "F"
+        self.grade = _GRADES[bisect_right(_GRADE_BOUNDS, self.total_score)]
 
-@dataclass
+@dataclass(slots=True)
 class ScoringWeights:
     """评分权重配置"""
     # 主要维度权重 (总和为1.0)
@@ -72,12 +112,57 @@ class ScoringWeights:
     good_practices_bonus: float = 5.0
     comprehensive_tests_bonus: float = 10.0
 
+@dataclass(slots=True)
+class StaticResultTally:
+    """静态分析结果的单次遍历统计"""
+    counts: Counter = field(default_factory=Counter)  # (category, severity) -> 数量
+    severities: Counter = field(default_factory=Counter)  # severity -> 数量（跨分类汇总）
+    high_risk_hits: int = 0  # 命中高风险安全规则的数量
+    has_type_message: bool = False  # 是否有提及类型的结果消息
+    
+    def category_count(self, category: str) -> int:
+        return sum(n for (cat, _), n in self.counts.items() if cat == category)
+    
+    def severity_counts(self, category: str) -> Tuple[int, int, int]:
+        """返回某分类下 (error, warning, 其他) 的数量"""
+        errors = warnings = others = 0
+        for (cat, sev), n in self.counts.items():
+            if cat != category:
+                continue
+            if sev == 'error':
+                errors += n
+            elif sev == 'warning':
+                warnings += n
+            else:
+                others += n
+        return errors, warnings, others
+
+# 没有静态分析结果时共享的空统计（只读）
+_EMPTY_TALLY = StaticResultTally()
+
 class IntelligentQualityScorer:
     """智能质量评分器"""
     
     def __init__(self, weights: Optional[ScoringWeights] = None):
         self.weights = weights or ScoringWeights()
         
+        # 分类权重按 _CATEGORY_ORDER 排列，与分类评分列表逐项相乘
+        self._category_weights = (
+            self.weights.maintainability,
+            self.weights.reliability,
+            self.weights.security,
+            self.weights.performance,
+            self.weights.style,
+            self.weights.complexity,
+        )
+        
+        # 复杂度子指标权重和的倒数，评分时以乘法代替除法
+        self._inv_complexity_weight_sum = 1.0 / (
+            self.weights.cyclomatic_complexity_weight +
+            self.weights.cognitive_complexity_weight +
+            self.weights.nesting_depth_weight
+        )
+        
         # 质量阈值配置
         self.thresholds = {
             'cyclomatic_complexity': {'good': 5, 'acceptable': 10, 'bad': 15},
@@ -88,6 +173,11 @@ class IntelligentQualityScorer:
             'technical_debt_minutes': {'good': 30, 'acceptable': 120, 'bad': 480}
         }
         
+        # 常用阈值的直接引用，省去评分时的外层字典查找
+        self._cc_thresholds = self.thresholds['cyclomatic_complexity']
+        self._cog_thresholds = self.thresholds['cognitive_complexity']
+        self._nest_thresholds = self.thresholds['nesting_depth']
+        
         # 最佳实践模式
         self.good_practices = {
             'typescript': ['strict type checking', 'interfaces', 'generics'],
@@ -103,78 +193,101 @@ class IntelligentQualityScorer:
     ) -> QualityScore:
         """计算综合质量评分"""
         
-        # 初始化分类评分
-        category_scores = {}
+        # 单次遍历统计静态分析结果，各分类评分共享；无结果时复用空统计
+        tally = self._tally_static_results(static_results) if static_results else _EMPTY_TALLY
         
-        # 1. 维护性评分
-        category_scores[QualityCategory.MAINTAINABILITY] = self._calculate_maintainability_score(
-            metrics, static_results
-        )
-        
-        # 2. 可靠性评分
-        category_scores[QualityCategory.RELIABILITY] = self._calculate_reliability_score(
-            metrics, static_results, quality_issues
-        )
-        
-        # 3. 安全性评分
-        category_scores[QualityCategory.SECURITY] = self._calculate_security_score(
-            static_results
-        )
-        
-        # 4. 性能评分
-        category_scores[QualityCategory.PERFORMANCE] = self._calculate_performance_score(
-            metrics, static_results
-        )
-        
-        # 5. 风格评分
-        category_scores[QualityCategory.STYLE] = self._calculate_style_score(
-            static_results
-        )
-        
-        # 6. 复杂度评分
-        category_scores[QualityCategory.COMPLEXITY] = self._calculate_complexity_score(
-            metrics
-        )
+        # 分类评分按 _CATEGORY_ORDER 的固定顺序存放在列表中
+        scores = [
+            self._calculate_maintainability_score(metrics, tally),              # 1. 维护性
+            self._calculate_reliability_score(metrics, tally, quality_issues),  # 2. 可靠性
+            self._calculate_security_score(tally),                              # 3. 安全性
+            self._calculate_performance_score(metrics, tally),                  # 4. 性能
+            self._calculate_style_score(tally),                                 # 5. 风格
+            self._calculate_complexity_score(metrics),                          # 6. 复杂度
+        ]
+        category_scores = dict(zip(_CATEGORY_ORDER, scores))
         
         # 计算加权总分
-        total_score = self._calculate_weighted_total(category_scores)
+        total_score = self._calculate_weighted_total(scores)
         
         # 应用奖励和惩罚
-        total_score = self._apply_bonuses_and_penalties(
-            total_score, metrics, static_results
-        )
+        total_score += self._compute_bonuses(metrics, tally)
         
         # 生成评分详情
         quality_score = QualityScore(
-            total_score=max(0, min(100, total_score)),
+            total_score=_clamp(total_score),
             category_scores=category_scores,
-            technical_debt_hours=metrics.technical_debt_minutes / 60.0,
-            priority_issues=self._identify_priority_issues(quality_issues, static_results),
-            recommendations=self._generate_recommendations(metrics, static_results),
-            strengths=self._identify_strengths(metrics, category_scores)
+            technical_debt_hours=metrics.technical_debt_minutes * _INV_60,
+            priority_issues=(
+                self._identify_priority_issues(quality_issues, static_results)
+                if static_results or quality_issues else []
+            ),
+            recommendations=self._generate_recommendations(metrics, tally),
+            strengths=self._identify_strengths(metrics, scores)
         )
         
         return quality_score
     
+    def score_project(
+        self,
+        files: List[Tuple[CodeMetrics, List[StaticAnalysisResult], List[QualityIssue]]],
+        max_workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+    ) -> List[QualityScore]:
+        """使用进程池并行评分多个文件，``files`` 为 (metrics, static_results, quality_issues)，结果顺序与输入一致"""
+        workers = max_workers or os.cpu_count() or 1
+        if len(files) <= 1 or workers == 1:
+            return [self._score_entry(entry) for entry in files]
+        
+        # 按每个进程约4个分块切分，摊薄进程间通信开销
+        if chunksize is None:
+            chunksize = max(1, len(files) // (4 * workers))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(self._score_entry, files, chunksize=chunksize))
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning("进程池不可用，改为串行评分: %s", e)
+            return [self._score_entry(entry) for entry in files]
+    
+    def _score_entry(
+        self,
+        entry: Tuple[CodeMetrics, List[StaticAnalysisResult], List[QualityIssue]]
+    ) -> QualityScore:
+        metrics, static_results, quality_issues = entry
+        return self.calculate_quality_score(metrics, static_results, quality_issues)
+    
+    def _tally_static_results(self, static_results: List[StaticAnalysisResult]) -> StaticResultTally:
+        """一次遍历按 (category, severity) 计数，并统计高风险安全规则命中与类型相关消息"""
+        tally = StaticResultTally()
+        counts = tally.counts
+        for result in static_results:
+            counts[(result.category, result.severity)] += 1
+            if result.category == 'security' and result.rule_id in _HIGH_RISK_RULES:
+                tally.high_risk_hits += 1
+            if not tally.has_type_message and _TYPE_RE.search(result.message):
+                tally.has_type_message = True
+        
+        # 由二维计数汇总出按严重程度的计数，只需遍历不同的键
+        for (_, severity), n in counts.items():
+            tally.severities[severity] += n
+        return tally
+    
     def _calculate_maintainability_score(
         self, 
         metrics: CodeMetrics, 
-        static_results: List[StaticAnalysisResult]
+        tally: StaticResultTally
     ) -> float:
         """计算维护性评分"""
-        mi_score = (
-            float(metrics.maintainability_index)
-            if hasattr(metrics, "maintainability_index")
-            else float(self._estimate_maintainability_index(metrics))
-        )
-        base_score = max(0.0, min(100.0, mi_score))
+        mi = getattr(metrics, "maintainability_index", None)
+        mi_score = float(mi) if mi is not None else float(self._estimate_maintainability_index(metrics))
+        base_score = _clamp(mi_score)
         
         # 复杂度惩罚
         complexity_penalty = 0
-        if metrics.cyclomatic_complexity > self.thresholds['cyclomatic_complexity']['acceptable']:
+        if metrics.cyclomatic_complexity > self._cc_thresholds['acceptable']:
             complexity_penalty += (metrics.cyclomatic_complexity - 10) * 2
         
-        if metrics.cognitive_complexity > self.thresholds['cognitive_complexity']['acceptable']:
+        if metrics.cognitive_complexity > self._cog_thresholds['acceptable']:
             complexity_penalty += (metrics.cognitive_complexity - 20) * 1.5
         
         # 长函数惩罚
@@ -184,10 +297,7 @@ class IntelligentQualityScorer:
         duplicate_penalty = len(metrics.duplicated_code_blocks) * 8
         
         # 静态分析问题惩罚
-        static_penalty = sum(
-            3 for result in static_results 
-            if result.category == 'style' and result.severity == 'warning'
-        )
+        static_penalty = tally.counts[('style', 'warning')] * 3
         
         final_score = (
             base_score
@@ -196,34 +306,27 @@ class IntelligentQualityScorer:
             - duplicate_penalty
             - static_penalty
         )
-        return max(0, min(100, final_score))
+        return _clamp(final_score)
     
     def _calculate_reliability_score(
         self, 
         metrics: CodeMetrics,
-        static_results: List[StaticAnalysisResult],
+        tally: StaticResultTally,
         quality_issues: List[QualityIssue]
     ) -> float:
         """计算可靠性评分"""
         base_score = 100.0
         
         # 错误严重程度惩罚
-        error_penalty = sum(
-            self.weights.error_penalty for result in static_results 
-            if result.severity == 'error'
-        )
-        
-        warning_penalty = sum(
-            self.weights.warning_penalty for result in static_results 
-            if result.severity == 'warning'
-        )
+        severities = tally.severities
+        error_penalty = severities['error'] * self.weights.error_penalty
+        warning_penalty = severities['warning'] * self.weights.warning_penalty
         
         # 质量问题惩罚
-        quality_penalty = sum(
-            15 if issue.severity == 'error' else 
-            8 if issue.severity == 'warning' else 3
-            for issue in quality_issues
-        )
+        issue_severities = Counter(issue.severity for issue in quality_issues)
+        errors = issue_severities['error']
+        warnings = issue_severities['warning']
+        quality_penalty = errors * 15 + warnings * 8 + (len(quality_issues) - errors - warnings) * 3
         
         # 复杂度可靠性影响
         complexity_reliability_impact = 0
@@ -231,44 +334,32 @@ class IntelligentQualityScorer:
             complexity_reliability_impact = (metrics.cyclomatic_complexity - 20) * 1.5
         
         final_score = base_score - error_penalty - warning_penalty - quality_penalty - complexity_reliability_impact
-        return max(0, min(100, final_score))
+        return _clamp(final_score)
     
-    def _calculate_security_score(self, static_results: List[StaticAnalysisResult]) -> float:
+    def _calculate_security_score(self, tally: StaticResultTally) -> float:
         """计算安全性评分"""
         base_score = 100.0
         
-        security_issues = [r for r in static_results if r.category == 'security']
-        
-        # 安全问题惩罚
-        security_penalty = 0
-        for issue in security_issues:
-            if issue.severity == 'error':
-                security_penalty += 25  # 严重安全问题
-            elif issue.severity == 'warning':
-                security_penalty += 10  # 中等安全问题
-            else:
-                security_penalty += 3   # 轻微安全问题
+        # 安全问题惩罚：严重25、中等10、轻微3
+        errors, warnings, others = tally.severity_counts('security')
+        security_penalty = errors * 25 + warnings * 10 + others * 3
         
         # 特定安全规则的额外惩罚
-        high_risk_patterns = ['B601', 'B602', 'B301']  # Bandit高风险规则
-        for issue in security_issues:
-            if issue.rule_id in high_risk_patterns:
-                security_penalty += 15
+        security_penalty += tally.high_risk_hits * 15
         
         final_score = base_score - security_penalty
-        return max(0, min(100, final_score))
+        return _clamp(final_score)
     
     def _calculate_performance_score(
         self, 
         metrics: CodeMetrics,
-        static_results: List[StaticAnalysisResult]
+        tally: StaticResultTally
     ) -> float:
         """计算性能评分"""
         base_score = 100.0
         
         # 性能相关问题惩罚
-        performance_issues = [r for r in static_results if r.category == 'performance']
-        performance_penalty = len(performance_issues) * 5
+        performance_penalty = tally.category_count('performance') * 5
         
         # 复杂度对性能的影响
         complexity_performance_impact = 0
@@ -284,55 +375,43 @@ class IntelligentQualityScorer:
         long_function_impact = len(metrics.long_functions) * 2
         
         final_score = base_score - performance_penalty - complexity_performance_impact - nesting_impact - long_function_impact
-        return max(0, min(100, final_score))
+        return _clamp(final_score)
     
-    def _calculate_style_score(self, static_results: List[StaticAnalysisResult]) -> float:
+    def _calculate_style_score(self, tally: StaticResultTally) -> float:
         """计算风格评分"""
         base_score = 100.0
         
-        style_issues = [r for r in static_results if r.category == 'style']
-        
         # 风格问题惩罚 (相对轻微)
-        style_penalty = 0
-        for issue in style_issues:
-            if issue.severity == 'error':
-                style_penalty += 8
-            elif issue.severity == 'warning':
-                style_penalty += 3
-            else:
-                style_penalty += 1
+        errors, warnings, others = tally.severity_counts('style')
+        style_penalty = errors * 8 + warnings * 3 + others
         
         final_score = base_score - style_penalty
-        return max(0, min(100, final_score))
+        return _clamp(final_score)
     
     def _calculate_complexity_score(self, metrics: CodeMetrics) -> float:
         """计算复杂度评分"""
         # 循环复杂度评分
         cc_score = self._score_by_threshold(
             metrics.cyclomatic_complexity,
-            self.thresholds['cyclomatic_complexity']
+            self._cc_thresholds
         ) * self.weights.cyclomatic_complexity_weight
         
         # 认知复杂度评分
         cog_score = self._score_by_threshold(
             metrics.cognitive_complexity,
-            self.thresholds['cognitive_complexity']
+            self._cog_thresholds
         ) * self.weights.cognitive_complexity_weight
         
         # 嵌套深度评分
         nest_score = self._score_by_threshold(
             metrics.max_nesting_depth,
-            self.thresholds['nesting_depth']
+            self._nest_thresholds
         ) * self.weights.nesting_depth_weight
         
         # 加权平均
-        weighted_score = (cc_score + cog_score + nest_score) / (
-            self.weights.cyclomatic_complexity_weight +
-            self.weights.cognitive_complexity_weight +
-            self.weights.nesting_depth_weight
-        )
+        weighted_score = (cc_score + cog_score + nest_score) * self._inv_complexity_weight_sum
         
-        return max(0, min(100, weighted_score * 100))
+        return _clamp(weighted_score * 100)
     
     def _score_by_threshold(self, value: float, thresholds: Dict[str, float]) -> float:
         """根据阈值计算评分 (0-1)"""
@@ -350,67 +429,31 @@ class IntelligentQualityScorer:
             excess_ratio = min(2.0, (value - thresholds['bad']) / thresholds['bad'])
             return max(0.0, 0.2 - (excess_ratio * 0.2))
     
-    def _calculate_weighted_total(self, category_scores: Dict[QualityCategory, float]) -> float:
-        """计算加权总分"""
-        total = 0.0
-        total += category_scores[QualityCategory.MAINTAINABILITY] * self.weights.maintainability
-        total += category_scores[QualityCategory.RELIABILITY] * self.weights.reliability
-        total += category_scores[QualityCategory.SECURITY] * self.weights.security
-        total += category_scores[QualityCategory.PERFORMANCE] * self.weights.performance
-        total += category_scores[QualityCategory.STYLE] * self.weights.style
-        total += category_scores[QualityCategory.COMPLEXITY] * self.weights.complexity
-        
-        return total
+    def _calculate_weighted_total(self, scores: List[float]) -> float:
+        """计算加权总分，``scores`` 按 _CATEGORY_ORDER 排列"""
+        return sum(map(mul, scores, self._category_weights))
     
-    def _apply_bonuses_and_penalties(
-        self, 
-        base_score: float, 
-        metrics: CodeMetrics, 
-        static_results: List[StaticAnalysisResult]
-    ) -> float:
-        """应用奖励和惩罚"""
-        adjusted_score = base_score
-        
-        # 最佳实践奖励
-        if self._has_good_practices(metrics):
-            adjusted_score += self.weights.good_practices_bonus
-        
-        # 类型安全奖励 (TypeScript, Python type hints)
-        if self._has_type_safety(metrics, static_results):
-            adjusted_score += 3
-        
-        # 文档完整性奖励
-        if self._has_good_documentation(metrics):
-            adjusted_score += 2
-        
-        return adjusted_score
-    
-    def _has_good_practices(self, metrics: CodeMetrics) -> bool:
-        """检查是否遵循最佳实践"""
-        # 简化版本：基于复杂度和结构
-        return (
-            metrics.cyclomatic_complexity <= 10 and
-            metrics.max_nesting_depth <= 3 and
-            len(metrics.long_functions) == 0
-        )
-    
-    def _has_type_safety(self, metrics: CodeMetrics, static_results: List[StaticAnalysisResult]) -> bool:
-        """检查类型安全"""
-        # 简化版本：基于文件扩展名和静态分析结果
-        has_types = (
-            metrics.language in ['typescript', 'java', 'rust', 'go'] or
-            (metrics.language == 'python' and any('type' in r.message.lower() for r in static_results))
-        )
-        return has_types
-    
-    def _has_good_documentation(self, metrics: CodeMetrics) -> bool:
-        """检查文档质量"""
-        # 简化版本：基于函数数量和复杂度的合理性
-        if metrics.function_count == 0:
-            return True  # 简单脚本无需过多文档
-        
-        # 复杂函数应该有文档
-        return len(metrics.long_functions) == 0 or metrics.function_count > 5
+    def _compute_bonuses(self, metrics: CodeMetrics, tally: StaticResultTally) -> float:
+        """计算奖励分：最佳实践、类型安全与文档完整性，各指标只读取一次"""
+        cyclomatic = metrics.cyclomatic_complexity
+        function_count = metrics.function_count
+        language = metrics.language
+        has_long_functions = bool(metrics.long_functions)
+        bonus = 0.0
+        
+        # 最佳实践奖励 (简化版本：基于复杂度和结构)
+        if cyclomatic <= 10 and metrics.max_nesting_depth <= 3 and not has_long_functions:
+            bonus += self.weights.good_practices_bonus
+        
+        # 类型安全奖励 (TypeScript, Python type hints)：基于语言和静态分析结果
+        if language in _TYPED_LANGUAGES or (language == 'python' and tally.has_type_message):
+            bonus += 3
+        
+        # 文档完整性奖励：简单脚本无需过多文档，复杂函数应该有文档
+        if function_count == 0 or not has_long_functions or function_count > 5:
+            bonus += 2
+        
+        return bonus
     
     def _identify_priority_issues(
         self, 
@@ -420,19 +463,19 @@ class IntelligentQualityScorer:
         """识别优先修复的问题"""
         priority_issues = []
         
-        # 安全问题最高优先级
-        security_issues = [r for r in static_results if r.category == 'security' and r.severity == 'error']
-        for issue in security_issues[:3]:  # 最多3个
+        # 安全问题最高优先级；只取前几个，不构造完整的过滤列表
+        security_issues = (r for r in static_results if r.category == 'security' and r.severity == 'error')
+        for issue in islice(security_issues, 3):  # 最多3个
             priority_issues.append(f"🚨 Security: {issue.message}")
         
         # 复杂度问题
-        complexity_issues = [i for i in quality_issues if i.category == 'complexity' and i.severity == 'error']
-        for issue in complexity_issues[:2]:  # 最多2个
+        complexity_issues = (i for i in quality_issues if i.category == 'complexity' and i.severity == 'error')
+        for issue in islice(complexity_issues, 2):  # 最多2个
             priority_issues.append(f"⚡ Complexity: {issue.message}")
         
         # 可靠性问题
-        reliability_issues = [r for r in static_results if r.severity == 'error'][:2]
-        for issue in reliability_issues:
+        reliability_issues = (r for r in static_results if r.severity == 'error')
+        for issue in islice(reliability_issues, 2):
             priority_issues.append(f"⚠️  Reliability: {issue.message}")
         
         return priority_issues
@@ -440,7 +483,7 @@ class IntelligentQualityScorer:
     def _generate_recommendations(
         self, 
         metrics: CodeMetrics,
-        static_results: List[StaticAnalysisResult]
+        tally: StaticResultTally
     ) -> List[str]:
         """生成改进建议"""
         recommendations = []
@@ -468,10 +511,10 @@ class IntelligentQualityScorer:
             )
         
         # 安全建议
-        security_issues = [r for r in static_results if r.category == 'security']
-        if security_issues:
+        security_count = tally.category_count('security')
+        if security_count:
             recommendations.append(
-                f"Address {len(security_issues)} security issues detected by static analysis"
+                f"Address {security_count} security issues detected by static analysis"
             )
         
         return recommendations[:5]  # 最多5个建议
@@ -479,15 +522,11 @@ class IntelligentQualityScorer:
     def _identify_strengths(
         self, 
         metrics: CodeMetrics,
-        category_scores: Dict[QualityCategory, float]
+        scores: List[float]
     ) -> List[str]:
-        """识别代码优势"""
-        strengths = []
-        
+        """识别代码优势，``scores`` 按 _CATEGORY_ORDER 排列"""
         # 基于分类评分识别优势
-        for category, score in category_scores.items():
-            if score >= 85:
-                strengths.append(f"Excellent {category.value}")
+        strengths = [label for label, score in zip(_EXCELLENT_LABELS, scores) if score >= 85]
         
         # 具体优势
         if metrics.cyclomatic_complexity <= 5:
@@ -521,18 +560,10 @@ class IntelligentQualityScorer:
     
     def _estimate_maintainability_index(self, metrics: CodeMetrics) -> float:
         """估算维护性指数"""
-        # 简化的维护性指数计算
-        base_score = 100
-        
-        # 复杂度惩罚
-        complexity_penalty = metrics.cyclomatic_complexity * 2
-        cognitive_penalty = metrics.cognitive_complexity * 1.5
-        
-        # 代码量惩罚
-        loc_penalty = max(0, (metrics.lines_of_code - 100) * 0.1)
-        
-        # 结构问题惩罚
-        structure_penalty = len(metrics.long_functions) * 5 + len(metrics.duplicated_code_blocks) * 8
-        
-        score = base_score - complexity_penalty - cognitive_penalty - loc_penalty - structure_penalty
-        return max(0, min(100, score))
+        return _estimate_mi(
+            metrics.cyclomatic_complexity,
+            metrics.cognitive_complexity,
+            metrics.lines_of_code,
+            len(metrics.long_functions),
+            len(metrics.duplicated_code_blocks),
+        )
@@ -2,19 +2,162 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import io
 import json
 import os
 import logging
+import re
 import subprocess
 import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:  # 可选依赖：orjson解析大体量工具输出更快
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:  # 可选依赖：进程内运行PyFlakes，免去每个文件启动一次解释器
+    from pyflakes import __version__ as pyflakes_version
+    from pyflakes import api as pyflakes_api
+    from pyflakes.reporter import Reporter as PyFlakesReporter
+except ImportError:  # pragma: no cover - optional dependency
+    pyflakes_version = ''
+    pyflakes_api = None
+    PyFlakesReporter = None
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+
+def _json_loads(data: str) -> Any:
+    # orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，调用方无需区分
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_sorted(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, sort_keys=True).encode('utf-8')
+
+# 单次工具调用最多传入的文件数，避免超出命令行长度限制
+_BATCH_SIZE = 200
+
+
+# 内存中最多缓存的 (分析器, 文件, 内容哈希) 结果条数
+_RESULT_CACHE_SIZE = 10_000
+
+# 工具不可用时的重新探测间隔（秒），以便服务运行期间安装的工具能被识别
+_AVAILABILITY_RETRY_SECONDS = 60.0
+
+
+def _cached_availability(check: Callable[..., bool]) -> Callable[..., bool]:
+    """缓存 is_available 的探测结果：可用即永久缓存，不可用则每隔一段时间重新探测，
+    避免每分析一个文件就启动一次 --version 子进程"""
+    @functools.wraps(check)
+    def is_available(self) -> bool:
+        cached = self.__dict__.get('_availability')
+        now = time.monotonic()
+        if cached is not None and (cached[0] or now - cached[1] < _AVAILABILITY_RETRY_SECONDS):
+            return cached[0]
+        available = check(self)
+        self._availability = (available, now)
+        return available
+    return is_available
+
+
+# ESLint规则分类，未列出的规则归为 general
+_ESLINT_RULE_CATEGORIES: Dict[str, str] = {
+    **dict.fromkeys(('no-eval', 'no-implied-eval', 'no-unsafe-negation'), 'security'),
+    **dict.fromkeys(('no-unnecessary-call', 'prefer-spread'), 'performance'),
+    **dict.fromkeys(('indent', 'quotes', 'semi', 'space-before-function-paren'), 'style'),
+    **dict.fromkeys(('complexity', 'max-depth', 'max-len'), 'complexity'),
+}
+
+_ESLINT_SUGGESTIONS: Dict[str, str] = {
+    'no-unused-vars': 'Remove unused variables or prefix with underscore',
+    'no-console': 'Replace console.log with proper logging framework',
+    'complexity': 'Break down function into smaller functions',
+    'max-depth': 'Reduce nesting depth by extracting functions',
+    'prefer-const': 'Use const for variables that are not reassigned',
+    'no-var': 'Use let or const instead of var'
+}
+
+_BANDIT_SUGGESTIONS: Dict[str, str] = {
+    'B101': 'Use assert only for debugging, not for data validation',
+    'B102': 'Use proper exception handling instead of exec',
+    'B103': 'Set appropriate file permissions (avoid 0o777)',
+    'B108': 'Use a proper tmp directory with appropriate permissions',
+    'B301': 'Use pickle alternatives like json for untrusted data',
+    'B601': 'Validate and sanitize shell command parameters',
+    'B602': 'Use subprocess with shell=False for better security'
+}
+
+# PyFlakes消息特征 -> (严重程度, 分类, 修复建议)，按顺序取第一个匹配项
+_PYFLAKES_PROFILES: Tuple[Tuple[str, Tuple[str, str, Optional[str]]], ...] = (
+    ('imported but unused', ('warning', 'style', 'Remove unused import or use __all__ to export')),
+    ('undefined name', ('warning', 'style', 'Define the variable or fix the spelling')),
+    ('redefined', ('info', 'general', 'Use different variable names to avoid redefinition')),
+)
+_PYFLAKES_DEFAULT_PROFILE: Tuple[str, str, Optional[str]] = ('warning', 'general', None)
+
+# PyFlakes输出格式: file:line: message，2.2 起为 file:line:col: message；
+# 文件名非贪婪匹配，兼容 Windows 盘符中的冒号
+_PYFLAKES_LINE_RE = re.compile(
+    r'^(?P<file>.+?):(?P<line>\d+):(?:(?P<column>\d+):)?[ \t]*(?P<message>.*?)[ \t\r]*$',
+    re.MULTILINE,
+)
+
+
+def _pyflakes_profile(message: str) -> Tuple[str, str, Optional[str]]:
+    """一次扫描消息，得到严重程度、分类和修复建议"""
+    for needle, profile in _PYFLAKES_PROFILES:
+        if needle in message:
+            return profile
+    return _PYFLAKES_DEFAULT_PROFILE
+
+
+def _extension(file_path: str) -> str:
+    """小写扩展名（含点）；按字符串切片取得，避免为每个文件构造 Path 对象。
+    目录名中的点会得到含路径分隔符的结果，不会命中任何扩展名表"""
+    dot = file_path.rfind('.')
+    return file_path[dot:].lower() if dot >= 0 else ''
+
+
+def _content_digest(file_path: str) -> Optional[bytes]:
+    """文件内容哈希，用作结果缓存键；读取失败时返回 None（不使用缓存）"""
+    try:
+        with open(file_path, 'rb') as handle:
+            return hashlib.blake2b(handle.read(), digest_size=16).digest()
+    except OSError:
+        return None
+
+
+def _batched(items: List[str], size: int = _BATCH_SIZE) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _path_resolver(file_paths: List[str]) -> Callable[[str], Optional[str]]:
+    """将工具输出中的文件路径映射回调用方传入的路径"""
+    by_abspath = {os.path.abspath(path): path for path in file_paths}
+    single = file_paths[0] if len(file_paths) == 1 else None
+    
+    def resolve(reported: str) -> Optional[str]:
+        return by_abspath.get(os.path.abspath(reported), single)
+    
+    return resolve
+
+@dataclass(slots=True, frozen=True)
 class StaticAnalysisResult:
     """静态分析结果"""
     tool_name: str
@@ -31,6 +174,9 @@ class StaticAnalysisResult:
 class StaticAnalyzer(ABC):
     """静态分析工具基类"""
     
+    # is_available 探测到的工具版本，参与结果缓存键，升级工具后旧结果自动失效
+    _tool_version = ''
+    
     @abstractmethod
     def analyze_file(self, file_path: str) -> List[StaticAnalysisResult]:
         """分析单个文件"""
@@ -40,12 +186,24 @@ class StaticAnalyzer(ABC):
     def is_available(self) -> bool:
         """检查工具是否可用"""
         pass
+    
+    def analyze_files(self, file_paths: List[str]) -> Dict[str, List[StaticAnalysisResult]]:
+        """分析多个文件，返回 路径 -> 结果；默认逐个调用 analyze_file，
+        支持批量输入的工具应覆盖此方法，以一次进程启动处理多个文件。
+        工具超时、崩溃或输出无法解析时，相应文件不出现在返回结果中，调用方据此不缓存"""
+        return {file_path: self.analyze_file(file_path) for file_path in file_paths}
+    
+    def cache_token(self) -> str:
+        """标识分析器、工具版本及其配置；结果缓存以此区分不同工具和配置"""
+        return f"{self.__class__.__name__}:{self._tool_version}"
 
 class ESLintAnalyzer(StaticAnalyzer):
     """ESLint JavaScript/TypeScript分析器"""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Path] = None):
         self.supported_extensions = {'.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs'}
+        # ESLint增量缓存目录，跨进程保留；未变更的文件无需重新检查
+        self.cache_dir = cache_dir or Path.home() / ".project-quality-hub" / "eslint-cache"
         self.config = {
             "env": {
                 "browser": True,
@@ -73,72 +231,126 @@ class ESLintAnalyzer(StaticAnalyzer):
     
     def analyze_file(self, file_path: str) -> List[StaticAnalysisResult]:
         """使用ESLint分析文件"""
-        if not self._is_supported_file(file_path) or not self.is_available():
-            return []
-            
+        return self.analyze_files([file_path]).get(file_path, [])
+    
+    def analyze_files(self, file_paths: List[str]) -> Dict[str, List[StaticAnalysisResult]]:
+        """使用一次ESLint调用分析多个文件（按批次切分）；失败批次中的文件不出现在结果中"""
+        paths = [path for path in file_paths if self._is_supported_file(path)]
+        results: Dict[str, List[StaticAnalysisResult]] = {}
+        if not paths or not self.is_available():
+            return results
+        
         try:
-            # 创建临时配置文件
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as config_file:
-                json.dump(self.config, config_file)
-                config_path = config_file.name
-                
+            config_text, digest = self._serialized_config()
+            config_path = self._config_file(config_text, digest)
+        except OSError as exc:
+            logger.warning("ESLint配置文件写入失败: %s", exc)
+            return results
+            
+        for batch in _batched(paths):
             # 运行ESLint
             cmd = [
                 'npx', 'eslint', 
                 '--config', config_path,
                 '--format', 'json',
-                file_path
+                *self._cache_args(digest),
+                *batch
             ]
             
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=30
-            )
-            
-            # 清理临时文件
-            os.unlink(config_path)
-            
-            if result.stdout:
-                return self._parse_eslint_output(result.stdout, file_path)
-                
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError) as exc:
-            logger.warning("ESLint分析失败 %s: %s", file_path, exc)
-        return []
+            try:
+                result = subprocess.run(
+                    cmd, 
+                    capture_output=True, 
+                    text=True, 
+                    timeout=30 + len(batch)
+                )
+                # 退出码 1 表示检查完成且有问题；2 表示配置错误或崩溃，输出不可信
+                if result.returncode not in (0, 1):
+                    raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+                batch_results = self._parse_eslint_output(result.stdout, batch)
+            except (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError, ValueError) as exc:
+                logger.warning("ESLint分析失败 %s: %s", batch, exc)
+                continue
+            for path in batch:
+                results[path] = batch_results.get(path, [])
+        return results
+    
+    def _serialized_config(self) -> Tuple[bytes, str]:
+        """序列化当前配置，并返回其内容哈希"""
+        config_text = _json_dumps_sorted(self.config)
+        return config_text, hashlib.sha1(config_text).hexdigest()[:16]
+    
+    def _config_file(self, config_text: bytes, digest: str) -> str:
+        """返回写有当前配置的文件路径；仅在文件缺失时写入
+
+        文件按配置内容哈希命名，放在按用户隔离的缓存目录中，同一配置的所有进程和实例
+        共用且从不删除，因此不会有进程在退出时删掉其他进程正要交给ESLint读取的配置
+        """
+        config_path = self.cache_dir / f"eslint-config-{digest}.json"
+        if config_path.exists():
+            return str(config_path)
+        
+        # 先写入临时文件再原子替换，避免并发调用读到写了一半的配置
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode='wb', suffix='.json', dir=self.cache_dir, delete=False
+        ) as config_file:
+            config_file.write(config_text)
+        os.replace(config_file.name, config_path)
+        return str(config_path)
+    
+    def cache_token(self) -> str:
+        return f"{super().cache_token()}:{self._serialized_config()[1]}"
+    
+    def _cache_args(self, digest: Optional[str] = None) -> List[str]:
+        """ESLint缓存参数；缓存文件按配置内容哈希命名，配置变化时自动全量重新检查"""
+        if digest is None:
+            digest = self._serialized_config()[1]
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            logger.debug("无法创建ESLint缓存目录 %s: %s", self.cache_dir, exc)
+            return []
+        return [
+            '--cache',
+            '--cache-location', str(self.cache_dir / f"eslint-{digest}.cache"),
+            '--cache-strategy', 'content',
+        ]
     
     def _is_supported_file(self, file_path: str) -> bool:
         """检查是否为支持的文件类型"""
-        return Path(file_path).suffix.lower() in self.supported_extensions
+        return _extension(file_path) in self.supported_extensions
     
-    def _parse_eslint_output(self, output: str, file_path: str) -> List[StaticAnalysisResult]:
-        """解析ESLint输出"""
-        results = []
+    def _parse_eslint_output(self, output: str, file_paths: List[str]) -> Dict[str, List[StaticAnalysisResult]]:
+        """解析ESLint输出，按 filePath 归属到传入的文件"""
+        results: Dict[str, List[StaticAnalysisResult]] = {}
+        resolve = _path_resolver(file_paths)
         
-        try:
-            data = json.loads(output)
-            
-            for file_result in data:
-                for message in file_result.get('messages', []):
-                    severity = self._map_severity(message.get('severity', 1))
-                    category = self._categorize_rule(message.get('ruleId', ''))
-                    
-                    result = StaticAnalysisResult(
-                        tool_name='ESLint',
-                        file_path=file_path,
-                        line=message.get('line', 1),
-                        column=message.get('column', 1),
-                        severity=severity,
-                        rule_id=message.get('ruleId', 'unknown'),
-                        message=message.get('message', ''),
-                        category=category,
-                        suggestion=self._get_suggestion(message.get('ruleId', '')),
-                        auto_fixable=message.get('fix') is not None
-                    )
-                    results.append(result)
-                    
-        except json.JSONDecodeError:
-            logger.warning("解析ESLint输出失败: %s", output)
+        # 输出无法解析时抛出 ValueError，由调用方按分析失败处理
+        data = _json_loads(output)
+        
+        for file_result in data:
+            file_path = resolve(file_result.get('filePath', ''))
+            if file_path is None:
+                continue
+            file_results = results.setdefault(file_path, [])
+            for message in file_result.get('messages', []):
+                severity = self._map_severity(message.get('severity', 1))
+                category = self._categorize_rule(message.get('ruleId', ''))
+                
+                result = StaticAnalysisResult(
+                    tool_name='ESLint',
+                    file_path=file_path,
+                    line=message.get('line', 1),
+                    column=message.get('column', 1),
+                    severity=severity,
+                    rule_id=message.get('ruleId', 'unknown'),
+                    message=message.get('message', ''),
+                    category=category,
+                    suggestion=self._get_suggestion(message.get('ruleId', '')),
+                    auto_fixable=message.get('fix') is not None
+                )
+                file_results.append(result)
             
         return results
     
@@ -148,39 +360,19 @@ class ESLintAnalyzer(StaticAnalyzer):
     
     def _categorize_rule(self, rule_id: str) -> str:
         """规则分类"""
-        security_rules = ['no-eval', 'no-implied-eval', 'no-unsafe-negation']
-        performance_rules = ['no-unnecessary-call', 'prefer-spread']
-        style_rules = ['indent', 'quotes', 'semi', 'space-before-function-paren']
-        complexity_rules = ['complexity', 'max-depth', 'max-len']
-        
-        if rule_id in security_rules:
-            return 'security'
-        elif rule_id in performance_rules:
-            return 'performance'
-        elif rule_id in style_rules:
-            return 'style'
-        elif rule_id in complexity_rules:
-            return 'complexity'
-        else:
-            return 'general'
+        return _ESLINT_RULE_CATEGORIES.get(rule_id, 'general')
     
     def _get_suggestion(self, rule_id: str) -> Optional[str]:
         """获取修复建议"""
-        suggestions = {
-            'no-unused-vars': 'Remove unused variables or prefix with underscore',
-            'no-console': 'Replace console.log with proper logging framework',
-            'complexity': 'Break down function into smaller functions',
-            'max-depth': 'Reduce nesting depth by extracting functions',
-            'prefer-const': 'Use const for variables that are not reassigned',
-            'no-var': 'Use let or const instead of var'
-        }
-        return suggestions.get(rule_id)
+        return _ESLINT_SUGGESTIONS.get(rule_id)
     
+    @_cached_availability
     def is_available(self) -> bool:
         """检查ESLint是否可用"""
         try:
             result = subprocess.run(['npx', 'eslint', '--version'], 
                                   capture_output=True, text=True, timeout=10)
+            self._tool_version = result.stdout.strip()
             return result.returncode == 0
         except Exception:
             return False
@@ -193,63 +385,74 @@ class BanditAnalyzer(StaticAnalyzer):
         
     def analyze_file(self, file_path: str) -> List[StaticAnalysisResult]:
         """使用Bandit分析Python文件安全问题"""
-        if not self._is_supported_file(file_path) or not self.is_available():
-            return []
+        return self.analyze_files([file_path]).get(file_path, [])
+    
+    def analyze_files(self, file_paths: List[str]) -> Dict[str, List[StaticAnalysisResult]]:
+        """使用一次Bandit调用分析多个文件（按批次切分）；失败批次中的文件不出现在结果中"""
+        paths = [path for path in file_paths if self._is_supported_file(path)]
+        results: Dict[str, List[StaticAnalysisResult]] = {}
+        if not paths or not self.is_available():
+            return results
             
-        try:
+        for batch in _batched(paths):
             cmd = [
                 'bandit', 
                 '-f', 'json',
                 '-ll',  # 低和高级别问题
-                file_path
+                *batch
             ]
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.stdout:
-                return self._parse_bandit_output(result.stdout, file_path)
-                
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError) as exc:
-            logger.warning("Bandit分析失败 %s: %s", file_path, exc)
-        return []
+            try:
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    timeout=30 + len(batch)
+                )
+                # 退出码 1 表示扫描完成且有问题；其他非零退出码为用法错误或崩溃
+                if result.returncode not in (0, 1):
+                    raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+                batch_results = self._parse_bandit_output(result.stdout, batch)
+            except (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError, ValueError) as exc:
+                logger.warning("Bandit分析失败 %s: %s", batch, exc)
+                continue
+            for path in batch:
+                results[path] = batch_results.get(path, [])
+        return results
     
     def _is_supported_file(self, file_path: str) -> bool:
-        return Path(file_path).suffix.lower() in self.supported_extensions
+        return _extension(file_path) in self.supported_extensions
     
-    def _parse_bandit_output(self, output: str, file_path: str) -> List[StaticAnalysisResult]:
-        """解析Bandit输出"""
-        results = []
+    def _parse_bandit_output(self, output: str, file_paths: List[str]) -> Dict[str, List[StaticAnalysisResult]]:
+        """解析Bandit输出，按 filename 归属到传入的文件"""
+        results: Dict[str, List[StaticAnalysisResult]] = {}
+        resolve = _path_resolver(file_paths)
         
-        try:
-            data = json.loads(output)
+        # 输出无法解析时抛出 ValueError，由调用方按分析失败处理
+        data = _json_loads(output)
+        
+        for issue in data.get('results', []):
+            file_path = resolve(issue.get('filename', ''))
+            if file_path is None:
+                continue
+            severity = self._map_bandit_severity(
+                issue.get('issue_severity', 'LOW'),
+                issue.get('issue_confidence', 'LOW')
+            )
             
-            for issue in data.get('results', []):
-                severity = self._map_bandit_severity(
-                    issue.get('issue_severity', 'LOW'),
-                    issue.get('issue_confidence', 'LOW')
-                )
-                
-                result = StaticAnalysisResult(
-                    tool_name='Bandit',
-                    file_path=file_path,
-                    line=issue.get('line_number', 1),
-                    column=issue.get('col_offset', 1),
-                    severity=severity,
-                    rule_id=issue.get('test_id', 'unknown'),
-                    message=issue.get('issue_text', ''),
-                    category='security',
-                    suggestion=self._get_bandit_suggestion(issue.get('test_id', '')),
-                    auto_fixable=False
-                )
-                results.append(result)
-                
-        except json.JSONDecodeError:
-            logger.warning("解析Bandit输出失败: %s", output)
+            result = StaticAnalysisResult(
+                tool_name='Bandit',
+                file_path=file_path,
+                line=issue.get('line_number', 1),
+                column=issue.get('col_offset', 1),
+                severity=severity,
+                rule_id=issue.get('test_id', 'unknown'),
+                message=issue.get('issue_text', ''),
+                category='security',
+                suggestion=self._get_bandit_suggestion(issue.get('test_id', '')),
+                auto_fixable=False
+            )
+            results.setdefault(file_path, []).append(result)
             
         return results
     
@@ -264,22 +467,16 @@ class BanditAnalyzer(StaticAnalyzer):
     
     def _get_bandit_suggestion(self, test_id: str) -> Optional[str]:
         """获取安全修复建议"""
-        suggestions = {
-            'B101': 'Use assert only for debugging, not for data validation',
-            'B102': 'Use proper exception handling instead of exec',
-            'B103': 'Set appropriate file permissions (avoid 0o777)',
-            'B108': 'Use a proper tmp directory with appropriate permissions',
-            'B301': 'Use pickle alternatives like json for untrusted data',
-            'B601': 'Validate and sanitize shell command parameters',
-            'B602': 'Use subprocess with shell=False for better security'
-        }
-        return suggestions.get(test_id)
+        return _BANDIT_SUGGESTIONS.get(test_id)
     
+    @_cached_availability
     def is_available(self) -> bool:
         """检查Bandit是否可用"""
         try:
             result = subprocess.run(['bandit', '--version'], 
                                   capture_output=True, text=True, timeout=10)
+            # 首行形如 "bandit 1.7.5"，其后是 Python 环境信息
+            self._tool_version = result.stdout.partition('\n')[0].strip()
             return result.returncode == 0
         except Exception:
             return False
@@ -292,8 +489,29 @@ class PyFlakesAnalyzer(StaticAnalyzer):
         
     def analyze_file(self, file_path: str) -> List[StaticAnalysisResult]:
         """使用PyFlakes分析Python文件"""
-        if not self._is_supported_file(file_path) or not self.is_available():
+        return self._analyze(file_path) or []
+    
+    def analyze_files(self, file_paths: List[str]) -> Dict[str, List[StaticAnalysisResult]]:
+        """逐个分析文件；失败的文件不出现在结果中"""
+        results: Dict[str, List[StaticAnalysisResult]] = {}
+        for file_path in file_paths:
+            file_results = self._analyze(file_path)
+            if file_results is not None:
+                results[file_path] = file_results
+        return results
+    
+    def _analyze(self, file_path: str) -> Optional[List[StaticAnalysisResult]]:
+        """分析单个文件，子进程超时或无法启动时返回 None"""
+        if not self._is_supported_file(file_path):
             return []
+        if not self.is_available():
+            return None
+        
+        if pyflakes_api is not None:
+            try:
+                return self._analyze_in_process(file_path)
+            except Exception as exc:
+                logger.debug("进程内PyFlakes失败，改用子进程 %s: %s", file_path, exc)
             
         try:
             cmd = ['python', '-m', 'pyflakes', file_path]
@@ -304,97 +522,88 @@ class PyFlakesAnalyzer(StaticAnalyzer):
                 text=True,
                 timeout=30
             )
-            
-            if result.stdout:
-                return self._parse_pyflakes_output(result.stdout, file_path)
-                
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError) as exc:
+        except (subprocess.TimeoutExpired, OSError) as exc:
             logger.warning("PyFlakes分析失败 %s: %s", file_path, exc)
-        return []
+            return None
+        return self._parse_pyflakes_output(result.stdout, file_path) if result.stdout else []
+    
+    def _analyze_in_process(self, file_path: str) -> List[StaticAnalysisResult]:
+        """在当前进程中调用PyFlakes API；输出与命令行一致，沿用同一解析逻辑"""
+        warnings = io.StringIO()
+        pyflakes_api.checkPath(file_path, PyFlakesReporter(warnings, io.StringIO()))
+        output = warnings.getvalue()
+        return self._parse_pyflakes_output(output, file_path) if output else []
     
     def _is_supported_file(self, file_path: str) -> bool:
-        return Path(file_path).suffix.lower() in self.supported_extensions
+        return _extension(file_path) in self.supported_extensions
     
     def _parse_pyflakes_output(self, output: str, file_path: str) -> List[StaticAnalysisResult]:
         """解析PyFlakes输出"""
         results = []
         
-        for line in output.strip().split('\n'):
-            if not line:
-                continue
-                
-            # PyFlakes输出格式: file:line: message
-            parts = line.split(':', 2)
-            if len(parts) >= 3:
-                try:
-                    line_num = int(parts[1])
-                    message = parts[2].strip()
-                    
-                    result = StaticAnalysisResult(
-                        tool_name='PyFlakes',
-                        file_path=file_path,
-                        line=line_num,
-                        column=1,
-                        severity=self._determine_severity(message),
-                        rule_id='pyflakes',
-                        message=message,
-                        category=self._categorize_message(message),
-                        suggestion=self._get_pyflakes_suggestion(message),
-                        auto_fixable=False
-                    )
-                    results.append(result)
-                    
-                except ValueError:
-                    continue
+        for match in _PYFLAKES_LINE_RE.finditer(output):
+            message = match['message']
+            severity, category, suggestion = _pyflakes_profile(message)
+            results.append(StaticAnalysisResult(
+                tool_name='PyFlakes',
+                file_path=file_path,
+                line=int(match['line']),
+                column=int(match['column'] or 1),
+                severity=severity,
+                rule_id='pyflakes',
+                message=message,
+                category=category,
+                suggestion=suggestion,
+                auto_fixable=False
+            ))
                     
         return results
     
     def _determine_severity(self, message: str) -> str:
         """根据消息确定严重程度"""
-        if 'undefined name' in message or 'imported but unused' in message:
-            return 'warning'
-        elif 'redefined' in message:
-            return 'info'
-        else:
-            return 'warning'
+        return _pyflakes_profile(message)[0]
     
     def _categorize_message(self, message: str) -> str:
         """消息分类"""
-        if 'imported but unused' in message or 'undefined name' in message:
-            return 'style'
-        elif 'redefined' in message:
-            return 'general'
-        else:
-            return 'general'
+        return _pyflakes_profile(message)[1]
     
     def _get_pyflakes_suggestion(self, message: str) -> Optional[str]:
         """获取修复建议"""
-        if 'imported but unused' in message:
-            return 'Remove unused import or use __all__ to export'
-        elif 'undefined name' in message:
-            return 'Define the variable or fix the spelling'
-        elif 'redefined' in message:
-            return 'Use different variable names to avoid redefinition'
-        return None
+        return _pyflakes_profile(message)[2]
     
+    @_cached_availability
     def is_available(self) -> bool:
         """检查PyFlakes是否可用"""
+        if pyflakes_api is not None:
+            self._tool_version = pyflakes_version
+            return True
         try:
+            # --version 只输出版本号（如 "3.2.0 Python 3.11.4 on Linux"），以退出码判断
             result = subprocess.run(['python', '-m', 'pyflakes', '--version'], 
                                   capture_output=True, text=True, timeout=10)
-            return 'pyflakes' in result.stdout.lower()
+            self._tool_version = result.stdout.strip()
+            return result.returncode == 0
         except Exception:
             return False
 
 class MultiLanguageStaticAnalyzer:
     """多语言静态分析器集成"""
     
-    def __init__(self):
+    def __init__(self, executor: Optional[ThreadPoolExecutor] = None):
+        # 同一文件的多个分析器都在等待子进程，用线程池并发执行；
+        # 默认使用独立线程池，避免占满调用方线程池后互相等待
+        self._executor = executor
+        self._owns_executor = executor is None
+        # JavaScript 和 TypeScript 共用一个 ESLint 实例，共享配置文件、可用性探测和缓存
+        eslint = ESLintAnalyzer()
         self.analyzers = {
-            'javascript': ESLintAnalyzer(),
-            'typescript': ESLintAnalyzer(), 
+            'javascript': eslint,
+            'typescript': eslint,
             'python': [BanditAnalyzer(), PyFlakesAnalyzer()]
         }
+        # 分析结果只取决于工具、配置和文件内容，按内容哈希缓存，未变更的文件不再重复分析
+        self._result_cache: OrderedDict[Tuple[str, str, bytes], List[StaticAnalysisResult]] = OrderedDict()
+        self._cache_lock = threading.Lock()
         self.language_mapping = {
             '.js': 'javascript',
             '.jsx': 'javascript',
@@ -410,43 +619,189 @@ class MultiLanguageStaticAnalyzer:
         if not os.path.exists(file_path):
             return []
             
-        file_extension = Path(file_path).suffix.lower()
-        language = self.language_mapping.get(file_extension)
+        language = self.language_mapping.get(_extension(file_path))
         
         if not language:
             return []
             
         results = []
-        analyzers = self.analyzers.get(language, [])
+        analyzers = self._active_analyzers(language)
+        if not analyzers:
+            return []
+        
+        digest = _content_digest(file_path)
+        if len(analyzers) == 1:
+            return self._run_analyzer(analyzers[0], file_path, digest)
         
+        # 并发运行各分析器，按分析器顺序合并结果以保持输出确定
+        executor = self._get_executor()
+        futures = [executor.submit(self._run_analyzer, analyzer, file_path, digest) for analyzer in analyzers]
+        for future in futures:
+            results.extend(future.result())
+                
+        return results
+    
+    def analyze_files(self, file_paths: List[str]) -> Dict[str, List[StaticAnalysisResult]]:
+        """批量分析多个文件：按语言分组，每个工具只调用一次批量接口"""
+        results: Dict[str, List[StaticAnalysisResult]] = {}
+        by_language: Dict[str, List[str]] = {}
+        for file_path in file_paths:
+            if not os.path.exists(file_path):
+                continue
+            language = self.language_mapping.get(_extension(file_path))
+            if language:
+                results[file_path] = []
+                by_language.setdefault(language, []).append(file_path)
+        
+        # 按分析器实例归并：共用同一实例的语言（如 JS/TS）合并为一次批量调用
+        grouped: Dict[int, Tuple[StaticAnalyzer, List[str]]] = {}
+        for language, paths in by_language.items():
+            for analyzer in self._active_analyzers(language):
+                grouped.setdefault(id(analyzer), (analyzer, []))[1].extend(paths)
+        jobs = list(grouped.values())
+        if not jobs:
+            return results
+        digests = {file_path: _content_digest(file_path) for file_path in results}
+        
+        # 各批量调用相互独立，并发执行后按提交顺序合并
+        if len(jobs) == 1:
+            batches = [self._run_analyzer_batch(*jobs[0], digests)]
+        else:
+            executor = self._get_executor()
+            futures = [
+                executor.submit(self._run_analyzer_batch, analyzer, paths, digests)
+                for analyzer, paths in jobs
+            ]
+            batches = [future.result() for future in futures]
+        
+        for batch in batches:
+            for file_path, file_results in batch.items():
+                results[file_path].extend(file_results)
+        return results
+    
+    def _active_analyzers(self, language: str) -> List[StaticAnalyzer]:
+        """某语言下当前可用的分析器；不可用的工具不再提交到线程池"""
+        analyzers = self.analyzers.get(language, [])
         # 处理单个分析器或分析器列表
         if not isinstance(analyzers, list):
             analyzers = [analyzers]
-            
-        for analyzer in analyzers:
-            try:
-                analyzer_results = analyzer.analyze_file(file_path)
-                results.extend(analyzer_results)
-            except Exception as exc:
-                logger.warning("分析器 %s 失败: %s", analyzer.__class__.__name__, exc)
-                
+        return [analyzer for analyzer in analyzers if analyzer.is_available()]
+    
+    def _run_analyzer_batch(
+        self,
+        analyzer: StaticAnalyzer,
+        file_paths: List[str],
+        digests: Optional[Dict[str, Optional[bytes]]] = None,
+    ) -> Dict[str, List[StaticAnalysisResult]]:
+        """运行单个分析器的批量接口，仅分析缓存未命中的文件；
+        失败时记录日志，失败的文件返回空结果且不写入缓存，下次重新分析"""
+        digests = digests or {}
+        token = analyzer.cache_token()
+        results: Dict[str, List[StaticAnalysisResult]] = {}
+        misses = []
+        for file_path in file_paths:
+            cached = self._cache_get(token, file_path, digests.get(file_path))
+            if cached is None:
+                misses.append(file_path)
+            else:
+                results[file_path] = cached
+        if not misses:
+            return results
+        
+        try:
+            fresh = analyzer.analyze_files(misses)
+        except Exception as exc:
+            logger.warning("分析器 %s 失败: %s", analyzer.__class__.__name__, exc)
+            return results
+        for file_path in misses:
+            file_results = fresh.get(file_path)
+            if file_results is None:
+                results[file_path] = []
+                continue
+            self._cache_put(token, file_path, digests.get(file_path), file_results)
+            results[file_path] = file_results
+        return results
+    
+    def _run_analyzer(
+        self, analyzer: StaticAnalyzer, file_path: str, digest: Optional[bytes] = None
+    ) -> List[StaticAnalysisResult]:
+        """运行单个分析器（优先使用缓存），失败时记录日志并返回空结果，不影响其他分析器；
+        失败的结果不写入缓存"""
+        token = analyzer.cache_token()
+        cached = self._cache_get(token, file_path, digest)
+        if cached is not None:
+            return cached
+        try:
+            results = analyzer.analyze_files([file_path]).get(file_path)
+        except Exception as exc:
+            logger.warning("分析器 %s 失败: %s", analyzer.__class__.__name__, exc)
+            return []
+        if results is None:
+            return []
+        self._cache_put(token, file_path, digest, results)
         return results
     
+    def _cache_get(
+        self, token: str, file_path: str, digest: Optional[bytes]
+    ) -> Optional[List[StaticAnalysisResult]]:
+        if digest is None:
+            return None
+        key = (token, file_path, digest)
+        with self._cache_lock:
+            cached = self._result_cache.get(key)
+            if cached is None:
+                return None
+            self._result_cache.move_to_end(key)
+        # 结果对象不可变，复制列表即可防止调用方修改缓存
+        return list(cached)
+    
+    def _cache_put(
+        self, token: str, file_path: str, digest: Optional[bytes], results: List[StaticAnalysisResult]
+    ) -> None:
+        if digest is None:
+            return
+        with self._cache_lock:
+            self._result_cache[(token, file_path, digest)] = list(results)
+            if len(self._result_cache) > _RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
+    def _iter_analyzers(self) -> Iterator[Tuple[str, StaticAnalyzer]]:
+        """遍历 (语言, 分析器)，兼容单个分析器或分析器列表"""
+        for language, analyzers in self.analyzers.items():
+            for analyzer in analyzers if isinstance(analyzers, list) else [analyzers]:
+                yield language, analyzer
+    
+    def _unique_analyzers(self) -> List[StaticAnalyzer]:
+        """去重后的分析器（同一实例可注册到多个语言）"""
+        return list({id(analyzer): analyzer for _, analyzer in self._iter_analyzers()}.values())
+    
+    def _probe_availability(self) -> Dict[int, bool]:
+        """并发探测所有分析器是否可用，返回 id(分析器) -> 是否可用；
+        每个探测都是一次子进程启动，串行执行会累加等待时间"""
+        executor = self._get_executor()
+        futures = {id(analyzer): executor.submit(analyzer.is_available) for analyzer in self._unique_analyzers()}
+        return {key: future.result() for key, future in futures.items()}
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            max_workers = len(self._unique_analyzers()) or 1
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='static-analyzer')
+        return self._executor
+    
+    def shutdown(self) -> None:
+        """释放自建的线程池"""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
     def get_available_analyzers(self) -> Dict[str, List[str]]:
         """获取可用的分析器"""
-        available = {}
+        available: Dict[str, List[str]] = {}
+        availability = self._probe_availability()
         
-        for language, analyzers in self.analyzers.items():
-            if not isinstance(analyzers, list):
-                analyzers = [analyzers]
-                
-            available_list = []
-            for analyzer in analyzers:
-                if analyzer.is_available():
-                    available_list.append(analyzer.__class__.__name__)
-                    
-            if available_list:
-                available[language] = available_list
+        for language, analyzer in self._iter_analyzers():
+            if availability[id(analyzer)]:
+                available.setdefault(language, []).append(analyzer.__class__.__name__)
                 
         return available
     
@@ -459,13 +814,10 @@ class MultiLanguageStaticAnalyzer:
         }
         
         missing = {}
-        for language, analyzers in self.analyzers.items():
-            if not isinstance(analyzers, list):
-                analyzers = [analyzers]
-                
-            for analyzer in analyzers:
-                if not analyzer.is_available():
-                    tool_name = analyzer.__class__.__name__.replace('Analyzer', '')
-                    missing[tool_name] = install_commands.get(tool_name, 'Unknown installation method')
+        availability = self._probe_availability()
+        for analyzer in self._unique_analyzers():
+            if not availability[id(analyzer)]:
+                tool_name = analyzer.__class__.__name__.replace('Analyzer', '')
+                missing[tool_name] = install_commands.get(tool_name, 'Unknown installation method')
                     
         return missing
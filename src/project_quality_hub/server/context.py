@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
 
 from ..core import EnhancedProjectMindInterface, ProjectMindInterface
 from ..core.project_memory import ProjectMemoryManager
@@ -13,26 +17,83 @@ from ..quality import (
     MultiLanguageStaticAnalyzer,
 )
 
+from .scoring import init_scoring_worker
 from .task_registry import TaskRegistry
 
 logger = logging.getLogger(__name__)
 
 
+class _LazyComponent:
+    """Builds a context component on first access and stores it on the instance.
+
+    This is a non-data descriptor, so once the instance attribute exists later
+    lookups bypass it entirely; the lock only guards the first construction,
+    which may race between tool handlers running on executor threads.
+    """
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._factory = factory
+        self._name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        with instance._components_lock:
+            if self._name not in instance.__dict__:
+                logger.debug("Initializing context component %s", self._name)
+                instance.__dict__[self._name] = self._factory()
+            return instance.__dict__[self._name]
+
+
+def _build_cpu_executor() -> ProcessPoolExecutor:
+    # Workers are spawned rather than forked: this process runs an event loop
+    # and thread pools, and a fork could copy locks held by other threads.
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_scoring_worker,
+    )
+
+
 class MCPServerContext:
-    """Holds shared singletons used by MCP tool handlers."""
+    """Holds shared singletons used by MCP tool handlers.
+
+    The executor and task registry are created eagerly; the heavier analysis
+    components and the process pool used for CPU-bound scoring are built the
+    first time a handler touches them.
+    """
+
+    enhanced_interface = _LazyComponent(EnhancedProjectMindInterface)
+    base_interface = _LazyComponent(ProjectMindInterface)
+    memory_manager = _LazyComponent(ProjectMemoryManager)
+    quality_analyzer = _LazyComponent(QualityAnalyzer)
+    static_analyzer = _LazyComponent(MultiLanguageStaticAnalyzer)
+    quality_scorer = _LazyComponent(IntelligentQualityScorer)
+    cpu_executor = _LazyComponent(_build_cpu_executor)
 
     def __init__(self, *, max_workers: int = 4) -> None:
+        self._components_lock = threading.RLock()
+        self.max_workers = max_workers
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self.tasks = TaskRegistry()
-        self.enhanced_interface = EnhancedProjectMindInterface()
-        self.base_interface = ProjectMindInterface()
-        self.memory_manager = ProjectMemoryManager()
-        self.quality_analyzer = QualityAnalyzer()
-        self.static_analyzer = MultiLanguageStaticAnalyzer()
-        self.quality_scorer = IntelligentQualityScorer()
         logger.debug("MCPServerContext initialized with max_workers=%s", max_workers)
 
     def shutdown(self) -> None:
         """Gracefully stop shared executors."""
         logger.debug("Shutting down MCPServerContext executor")
         self.executor.shutdown(wait=False)
+        self.discard_cpu_executor()
+        # Only tear down components that were actually built
+        static_analyzer = self.__dict__.get("static_analyzer")
+        if static_analyzer is not None:
+            static_analyzer.shutdown()
+
+    def discard_cpu_executor(self) -> None:
+        """Drop the process pool (e.g. once broken); the next access builds a new one."""
+        with self._components_lock:
+            cpu_executor = self.__dict__.pop("cpu_executor", None)
+        if cpu_executor is not None:
+            cpu_executor.shutdown(wait=False, cancel_futures=True)
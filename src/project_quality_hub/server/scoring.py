@@ -0,0 +1,100 @@
+"""Per-file quality scoring shared by tool handlers and process-pool workers."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from ..quality import (
+    CodeMetrics,
+    IntelligentQualityScorer,
+    MultiLanguageStaticAnalyzer,
+    QualityAnalyzer,
+    QualityIssue,
+    QualityScore,
+    StaticAnalysisResult,
+)
+from .utils import to_serializable
+
+# Analysis components of a scoring worker process, built by init_scoring_worker
+_worker_components: Tuple[QualityAnalyzer, MultiLanguageStaticAnalyzer, IntelligentQualityScorer] | None = None
+
+
+def _score(
+    quality_analyzer: QualityAnalyzer,
+    static_analyzer: MultiLanguageStaticAnalyzer,
+    quality_scorer: IntelligentQualityScorer,
+    file_path: str,
+) -> Tuple[CodeMetrics, List[QualityIssue], List[StaticAnalysisResult], QualityScore]:
+    metrics, issues = quality_analyzer.analyze_file(file_path)
+    if not metrics:
+        raise ValueError(f"Unable to analyze file metrics: {file_path}")
+
+    static_results = static_analyzer.analyze_file(file_path)
+    score = quality_scorer.calculate_quality_score(metrics, static_results, issues)
+    return metrics, issues, static_results, score
+
+
+def _category_scores(score: QualityScore) -> Dict[str, float]:
+    return {
+        getattr(category, "value", str(category)): value
+        for category, value in score.category_scores.items()
+    }
+
+
+def score_file(
+    quality_analyzer: QualityAnalyzer,
+    static_analyzer: MultiLanguageStaticAnalyzer,
+    quality_scorer: IntelligentQualityScorer,
+    file_path: str | Path,
+) -> Dict[str, Any]:
+    """Analyze and score a single file, keeping the raw analysis details."""
+    file_path = os.fspath(file_path)
+    metrics, issues, static_results, score = _score(quality_analyzer, static_analyzer, quality_scorer, file_path)
+    return {
+        "file_path": file_path,
+        "total_score": score.total_score,
+        "grade": score.grade,
+        "category_scores": _category_scores(score),
+        "technical_debt_hours": score.technical_debt_hours,
+        "priority_issues": score.priority_issues,
+        "recommendations": score.recommendations,
+        "strengths": score.strengths,
+        # Raw objects; call_tool serialises the whole response once
+        "metrics": metrics,
+        "quality_issues": issues,
+        "static_analysis": static_results,
+    }
+
+
+def score_file_summary(
+    quality_analyzer: QualityAnalyzer,
+    static_analyzer: MultiLanguageStaticAnalyzer,
+    quality_scorer: IntelligentQualityScorer,
+    file_path: str | Path,
+) -> Dict[str, Any]:
+    """Score a single file, keeping only what a project summary reports."""
+    file_path = os.fspath(file_path)
+    score = _score(quality_analyzer, static_analyzer, quality_scorer, file_path)[3]
+    return {
+        "file_path": file_path,
+        "total_score": score.total_score,
+        "grade": score.grade,
+        "category_scores": _category_scores(score),
+    }
+
+
+def init_scoring_worker() -> None:
+    """Process-pool initializer: build the analysis components once per worker."""
+    global _worker_components
+    _worker_components = (QualityAnalyzer(), MultiLanguageStaticAnalyzer(), IntelligentQualityScorer())
+
+
+def score_file_in_worker(file_path: str, include_details: bool) -> Dict[str, Any]:
+    """Process-pool entry point; returns plain data so the result pickles cheaply."""
+    if _worker_components is None:
+        init_scoring_worker()
+    if include_details:
+        return to_serializable(score_file(*_worker_components, file_path))
+    return score_file_summary(*_worker_components, file_path)
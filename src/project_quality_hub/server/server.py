@@ -15,9 +15,31 @@ from mcp.types import TextContent
 from .context import MCPServerContext
 from .tools import ToolHandlers
 
+try:  # Optional dependency: orjson encodes large tool results much faster
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps_result(result: Any, pretty: bool = False) -> str:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(result, option=option).decode("utf-8")
+    if pretty:
+        return json.dumps(result, ensure_ascii=False, indent=2)
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+
+
+def _is_small_result(result: Any) -> bool:
+    """Cheap guess for payloads that serialise faster than a thread hand-off."""
+    if not isinstance(result, (dict, list)):
+        return True
+    values = result.values() if isinstance(result, dict) else result
+    return len(result) <= 16 and not any(isinstance(value, (dict, list)) for value in values)
+
+
 def _configure_logging() -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
@@ -36,7 +58,14 @@ async def handle_list_tools() -> List[Any]:
 async def handle_call_tool(name: str, arguments: Dict[str, Any] | None) -> List[TextContent]:
     arguments = arguments or {}
     result = await handlers.call_tool(name, arguments)
-    payload = json.dumps(result, ensure_ascii=False, indent=2)
+    pretty = handlers.prefers_pretty(name)
+    if _is_small_result(result):
+        payload = _dumps_result(result, pretty)
+    else:
+        # Large reports are encoded on a worker thread so the event loop keeps
+        # dispatching other tool calls. The default executor is used rather
+        # than context.executor, whose workers may be busy with long analyses.
+        payload = await asyncio.to_thread(_dumps_result, result, pretty)
     return [TextContent(type="text", text=payload)]
 
 
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import threading
+import time
 import traceback
 import uuid
+from collections import deque
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Callable, Dict, Optional
 
@@ -30,20 +32,46 @@ class TaskRecord:
     task_id: str
     name: str
     submitted_at: datetime = field(default_factory=datetime.utcnow)
-    started_at: Optional[datetime] = None
-    finished_at: Optional[datetime] = None
+    # Transitions are stamped with the monotonic clock and only converted to
+    # wall-clock datetimes (relative to submitted_at) when serialised.
+    submitted_ns: int = field(default_factory=time.monotonic_ns)
+    started_ns: Optional[int] = None
+    finished_ns: Optional[int] = None
     status: TaskStatus = TaskStatus.PENDING
     result: Any = None
     error_message: Optional[str] = None
     error_traceback: Optional[str] = None
     future: Optional[Future] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def started_at(self) -> Optional[datetime]:
+        return self._wall_clock(self.started_ns)
+
+    @property
+    def finished_at(self) -> Optional[datetime]:
+        return self._wall_clock(self.finished_ns)
+
+    def _wall_clock(self, stamp_ns: Optional[int]) -> Optional[datetime]:
+        if stamp_ns is None:
+            return None
+        return self.submitted_at + timedelta(microseconds=(stamp_ns - self.submitted_ns) // 1000)
 
 
 class TaskRegistry:
-    """Tracks background tasks executed through a shared ThreadPoolExecutor."""
+    """Tracks background tasks executed through a shared ThreadPoolExecutor.
 
-    def __init__(self) -> None:
+    Only the ``max_completed`` most recently finished tasks are retained; older
+    completed or failed records (and their results) are evicted and can no
+    longer be queried. Pending and running tasks are never evicted.
+    """
+
+    def __init__(self, *, max_completed: int = 1024) -> None:
+        # Single-key dict reads are atomic; the registry lock only guards
+        # insertion, eviction and iteration, while each record carries its own lock.
         self._tasks: Dict[str, TaskRecord] = {}
+        self._finished: deque[str] = deque()
+        self._max_completed = max_completed
         self._lock = threading.Lock()
 
     def submit(
@@ -63,55 +91,79 @@ class TaskRegistry:
         record = TaskRecord(task_id=task_id, name=name)
 
         def _runner() -> None:
-            with self._lock:
+            with record._lock:
                 record.status = TaskStatus.RUNNING
-                record.started_at = datetime.utcnow()
+                record.started_ns = time.monotonic_ns()
             try:
                 result = func(*args, **kwargs)
                 serialised = to_serializable(result)
-                with self._lock:
+                with record._lock:
                     record.result = serialised
                     record.status = TaskStatus.COMPLETED
-                    record.finished_at = datetime.utcnow()
+                    record.finished_ns = time.monotonic_ns()
             except Exception as exc:  # pragma: no cover - defensive path
-                with self._lock:
+                with record._lock:
                     record.error_message = str(exc)
                     record.error_traceback = traceback.format_exc()
                     record.status = TaskStatus.FAILED
-                    record.finished_at = datetime.utcnow()
-
-        future = executor.submit(_runner)
-        record.future = future
+                    record.finished_ns = time.monotonic_ns()
+            self._mark_finished(task_id)
 
+        # Register before submitting so a task that finishes immediately is
+        # already known when it is queued for eviction.
         with self._lock:
             self._tasks[task_id] = record
+        try:
+            record.future = executor.submit(_runner)
+        except Exception:
+            with self._lock:
+                self._tasks.pop(task_id, None)
+            raise
 
         return task_id
 
-    def get_task_state(self, task_id: str) -> Dict[str, Any]:
-        """Return a serialisable snapshot for a task."""
+    def _mark_finished(self, task_id: str) -> None:
+        """Queue a finished task for eviction and drop the oldest beyond the cap."""
 
         with self._lock:
-            record = self._tasks.get(task_id)
+            self._finished.append(task_id)
+            while len(self._finished) > self._max_completed:
+                self._tasks.pop(self._finished.popleft(), None)
+
+    def get_task_state(self, task_id: str) -> Dict[str, Any]:
+        """Return a serialisable snapshot for a task."""
 
+        record = self._tasks.get(task_id)
         if not record:
             raise KeyError(f"Task not found: {task_id}")
 
-        return {
-            "task_id": record.task_id,
-            "name": record.name,
-            "status": record.status.value,
-            "submitted_at": to_serializable(record.submitted_at),
-            "started_at": to_serializable(record.started_at),
-            "finished_at": to_serializable(record.finished_at),
-            "result": record.result,
-            "error_message": record.error_message,
-            "error_traceback": record.error_traceback,
-        }
+        with record._lock:
+            return _snapshot(record)
 
     def list_tasks(self) -> Dict[str, Dict[str, Any]]:
         """Return a snapshot for all tracked tasks."""
 
         with self._lock:
-            task_ids = list(self._tasks.keys())
-        return {task_id: self.get_task_state(task_id) for task_id in task_ids}
+            records = list(self._tasks.values())
+
+        snapshots = {}
+        for record in records:
+            with record._lock:
+                snapshots[record.task_id] = _snapshot(record)
+        return snapshots
+
+
+def _snapshot(record: TaskRecord) -> Dict[str, Any]:
+    """Serialise a task record; callers must hold the record's lock."""
+
+    return {
+        "task_id": record.task_id,
+        "name": record.name,
+        "status": record.status.value,
+        "submitted_at": to_serializable(record.submitted_at),
+        "started_at": to_serializable(record.started_at),
+        "finished_at": to_serializable(record.finished_at),
+        "result": record.result,
+        "error_message": record.error_message,
+        "error_traceback": record.error_traceback,
+    }
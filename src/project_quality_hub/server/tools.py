@@ -5,48 +5,336 @@ from __future__ import annotations
 import asyncio
 import inspect
 import logging
-from collections import defaultdict
+import os
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 
 import mcp.types as types
 
+from ..quality import QualityCategory
 from .context import MCPServerContext
+from .scoring import score_file, score_file_in_worker, score_file_summary
 from .utils import ensure_project_path, to_serializable
 
+try:  # Optional dependency: fastjsonschema compiles schemas to plain Python
+    import fastjsonschema
+except ImportError:  # pragma: no cover - optional dependency
+    fastjsonschema = None
+
+try:  # Optional dependency: installed alongside recent mcp releases
+    import jsonschema
+except ImportError:  # pragma: no cover - optional dependency
+    jsonschema = None
+
 logger = logging.getLogger(__name__)
 
+# Smaller score_project batches stay on threads; spawning workers costs more
+_PROCESS_POOL_MIN_FILES = 8
+
+# Category keys reported by _score_file, in scorer order
+_CATEGORY_KEYS = tuple(category.value for category in QualityCategory)
+
+_SUPPORTED_EXTENSIONS = frozenset(
+    {
+        ".py",
+        ".js",
+        ".ts",
+        ".tsx",
+        ".jsx",
+        ".java",
+        ".go",
+        ".rs",
+        ".c",
+        ".cpp",
+        ".h",
+        ".hpp",
+    }
+)
+
+
+# VCS metadata, dependency trees, virtualenvs and build output never hold
+# project sources worth scoring, and can dwarf the real tree.
+_SKIPPED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        "venv",
+        ".venv",
+        "__pycache__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".tox",
+        "dist",
+        "build",
+        "target",
+    }
+)
+
+
+def _scandir_recursive(root: str) -> Iterator[str]:
+    """Yield supported source files below ``root``.
+
+    Uses ``os.scandir`` so file-type checks come from the cached directory
+    entry instead of a ``stat`` per path. Symlinked directories and the
+    directories in ``_SKIPPED_DIRS`` are not descended into; unreadable
+    directories are skipped. Files are produced lazily so callers can stop
+    the walk early.
+    """
+
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _SKIPPED_DIRS:
+                                subdirectories.append(entry.path)
+                            continue
+                        name = entry.name
+                        dot = name.rfind(".")
+                        if dot > 0 and name[dot:].lower() in _SUPPORTED_EXTENSIONS and entry.is_file():
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError as exc:
+            logger.debug("Skipping unreadable directory %s: %s", directory, exc)
+        # Reversed so directories are visited in listing order
+        pending.extend(reversed(subdirectories))
+
+
+@lru_cache(maxsize=256)
+def _resolve_file_path(project_root: str, file_path: str, cwd: str | None) -> str:
+    """Memoised file path resolution; ``cwd`` is only set when the result depends on it."""
+
+    # os.path.join already keeps an absolute right-hand side as is
+    candidate = os.path.join(project_root, file_path)
+    if cwd is not None:
+        candidate = os.path.join(cwd, candidate)
+    return os.path.realpath(os.path.expanduser(candidate))
+
+
+# Static tool metadata; handlers are bound per instance as ``_handle_<name>``.
+_TOOL_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "analyze_project": {
+        "description": "Analyze the target project and refresh the knowledge graph.",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "project_root": {"type": "string"},
+                "force": {
+                    "type": "boolean",
+                    "description": "Force a full re-analysis even if cached data exists",
+                    "default": False,
+                },
+                "enable_monitoring": {
+                    "type": "boolean",
+                    "description": "Start smart monitoring after a successful analysis",
+                    "default": False,
+                },
+            },
+            "required": ["project_root"],
+        },
+    },
+    "get_project_summary": {
+        "description": "Retrieve the current project summary including branch and monitoring status.",
+        "schema": {
+            "type": "object",
+            "properties": {"project_root": {"type": "string"}},
+            "required": ["project_root"],
+        },
+        "pretty": True,
+    },
+    "list_branches": {
+        "description": "List analyzed branches for the project.",
+        "schema": {
+            "type": "object",
+            "properties": {"project_root": {"type": "string"}},
+            "required": ["project_root"],
+        },
+    },
+    "analyze_branch": {
+        "description": "Analyze a specific Git branch.",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "project_root": {"type": "string"},
+                "branch": {"type": "string"},
+                "force": {"type": "boolean", "default": False},
+            },
+            "required": ["project_root", "branch"],
+        },
+    },
+    "switch_branch": {
+        "description": "Switch analysis context to another branch.",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "project_root": {"type": "string"},
+                "branch": {"type": "string"},
+            },
+            "required": ["project_root", "branch"],
+        },
+    },
+    "compare_branches": {
+        "description": "Compare two branches and return structural differences.",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "project_root": {"type": "string"},
+                "branch_a": {"type": "string"},
+                "branch_b": {"type": "string"},
+            },
+            "required": ["project_root", "branch_a", "branch_b"],
+        },
+    },
+    "start_monitoring": {
+        "description": "Start real-time monitoring for incremental updates.",
+        "schema": {
+            "type": "object",
+            "properties": {"project_root": {"type": "string"}},
+            "required": ["project_root"],
+        },
+    },
+    "stop_monitoring": {
+        "description": "Stop real-time monitoring.",
+        "schema": {
+            "type": "object",
+            "properties": {"project_root": {"type": "string"}},
+            "required": ["project_root"],
+        },
+    },
+    "get_monitoring_status": {
+        "description": "Get the monitoring and incremental update status.",
+        "schema": {
+            "type": "object",
+            "properties": {"project_root": {"type": "string"}},
+            "required": ["project_root"],
+        },
+        "pretty": True,
+    },
+    "score_project": {
+        "description": "Compute quality scores for the project.",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "project_root": {"type": "string"},
+                "max_files": {"type": "integer", "minimum": 1, "default": 50},
+                "include_details": {"type": "boolean", "default": False},
+            },
+            "required": ["project_root"],
+        },
+    },
+    "score_file": {
+        "description": "Score a single file and return detailed diagnostics.",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "project_root": {"type": "string"},
+                "file_path": {"type": "string"},
+            },
+            "required": ["project_root", "file_path"],
+        },
+    },
+    "get_task_result": {
+        "description": "Fetch the status/result of a previously scheduled task.",
+        "schema": {
+            "type": "object",
+            "properties": {"task_id": {"type": "string"}},
+            "required": ["task_id"],
+        },
+    },
+    "list_tasks": {
+        "description": "List all tracked background tasks.",
+        "schema": {"type": "object", "properties": {}},
+    },
+}
+
+
+
+def _compile_validator(schema: Dict[str, Any]) -> Callable[[Dict[str, Any]], None] | None:
+    """Build an argument validator for ``schema`` once, or ``None`` if no backend is installed."""
+    if fastjsonschema is not None:
+        return fastjsonschema.compile(schema)
+    if jsonschema is not None:
+        validator = jsonschema.Draft7Validator(schema)
+
+        def validate(arguments: Dict[str, Any]) -> None:
+            error = jsonschema.exceptions.best_match(validator.iter_errors(arguments))
+            if error is not None:
+                raise ValueError(error.message)
+
+        return validate
+    return None
+
+
+# Compiled at import time so calls never rebuild validators
+_VALIDATORS: Dict[str, Callable[[Dict[str, Any]], None] | None] = {
+    name: _compile_validator(spec["schema"]) for name, spec in _TOOL_SCHEMAS.items()
+}
 
 class ToolHandlers:
     """Dispatches MCP tool calls to concrete implementations."""
 
     def __init__(self, context: MCPServerContext) -> None:
         self.context = context
-        self._tool_specs = self._build_tool_specs()
-
-    def list_tools(self) -> List[types.Tool]:
-        """Return MCP tool descriptors."""
-
-        return [
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            name: getattr(self, f"_handle_{name}") for name in _TOOL_SCHEMAS
+        }
+        # Decided once so call_tool does not inspect every result it gets back
+        self._async_tools = frozenset(
+            name for name, handler in self._handlers.items() if inspect.iscoroutinefunction(handler)
+        )
+        # project_root -> (storage version, file list) for _get_cached_file_list
+        self._file_lists: Dict[str, Tuple[Tuple[int, int], List[str]]] = {}
+        self._tools = [
             types.Tool(
                 name=name,
                 description=spec["description"],
                 inputSchema=spec["schema"],
             )
-            for name, spec in self._tool_specs.items()
+            for name, spec in _TOOL_SCHEMAS.items()
         ]
 
+    def list_tools(self) -> List[types.Tool]:
+        """Return MCP tool descriptors."""
+
+        return self._tools
+
+    def prefers_pretty(self, name: str) -> bool:
+        """Whether a tool's output should be indented for human readers.
+
+        Tools default to compact JSON; only small status-style tools opt in.
+        """
+
+        return bool(_TOOL_SCHEMAS.get(name, {}).get("pretty", False))
+
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
         """Execute a tool call and return serialisable output."""
 
-        if name not in self._tool_specs:
+        handler = self._handlers.get(name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {name}")
 
-        handler = self._tool_specs[name]["handler"]
+        validate = _VALIDATORS[name]
+        if validate is not None:
+            try:
+                validate(arguments)
+            except ValueError as exc:
+                raise ValueError(f"Invalid arguments for {name}: {exc}") from exc
+
         try:
-            result = handler(arguments)
-            if inspect.iscoroutine(result) or isinstance(result, asyncio.Future):
-                result = await result
+            if name in self._async_tools:
+                result = await handler(arguments)
+            else:
+                result = handler(arguments)
             return to_serializable(result)
         except Exception:  # pragma: no cover - defensive logging
             logger.exception("Tool execution failed: %s", name)
@@ -58,214 +346,47 @@ class ToolHandlers:
         logger.debug("Scheduled task %s (%s)", task_id, name)
         return {"status": "scheduled", "task_id": task_id}
 
-    def _resolve_file_path(self, project_root: str, file_path: str) -> Path:
-        candidate = Path(file_path)
-        if not candidate.is_absolute():
-            candidate = Path(project_root) / candidate
-        return candidate.expanduser().resolve()
+    def _resolve_file_path(self, project_root: str, file_path: str) -> str:
+        relative_to_cwd = not os.path.isabs(file_path) and not os.path.isabs(project_root)
+        return _resolve_file_path(project_root, file_path, os.getcwd() if relative_to_cwd else None)
 
     def _get_cached_file_list(self, project_root: str) -> List[str]:
-        knowledge_graph = self.context.base_interface.memory_manager.load_project(project_root)
-        if knowledge_graph and getattr(knowledge_graph, "files", None):
-            return list(knowledge_graph.files.keys())
-        return []
-
-    def _discover_project_files(self, project_root: str) -> List[str]:
-        supported_extensions = {
-            ".py",
-            ".js",
-            ".ts",
-            ".tsx",
-            ".jsx",
-            ".java",
-            ".go",
-            ".rs",
-            ".c",
-            ".cpp",
-            ".h",
-            ".hpp",
-        }
+        # Reloading the knowledge graph is far costlier than the two stats
+        # behind storage_version, so the list is reused until storage changes.
+        memory_manager = self.context.base_interface.memory_manager
+        version = memory_manager.storage_version(project_root)
+        cached = self._file_lists.get(project_root)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        knowledge_graph = memory_manager.load_project(project_root)
         files: List[str] = []
-        root_path = Path(project_root)
-        for path in root_path.rglob("*"):
-            if path.is_file() and path.suffix.lower() in supported_extensions:
-                files.append(str(path))
+        if knowledge_graph and getattr(knowledge_graph, "files", None):
+            files = list(knowledge_graph.files.keys())
+        self._file_lists[project_root] = (version, files)
         return files
 
-    def _score_file(self, file_path: Path) -> Dict[str, Any]:
-        metrics, issues = self.context.quality_analyzer.analyze_file(str(file_path))
-        if not metrics:
-            raise ValueError(f"Unable to analyze file metrics: {file_path}")
-
-        static_results = self.context.static_analyzer.analyze_file(str(file_path))
-        score = self.context.quality_scorer.calculate_quality_score(metrics, static_results, issues)
+    def _discover_project_files(self, project_root: str, limit: int | None = None) -> Iterator[str]:
+        files = _scandir_recursive(project_root)
+        return files if limit is None else islice(files, limit)
 
-        category_scores = {
-            getattr(category, "value", str(category)): value
-            for category, value in score.category_scores.items()
-        }
+    def _select_files_to_score(self, project_root: str, max_files: int) -> List[str]:
+        return self._get_cached_file_list(project_root)[:max_files] or list(
+            self._discover_project_files(project_root, limit=max_files)
+        )
 
-        return {
-            "file_path": str(file_path),
-            "total_score": score.total_score,
-            "grade": score.grade,
-            "category_scores": category_scores,
-            "technical_debt_hours": score.technical_debt_hours,
-            "priority_issues": score.priority_issues,
-            "recommendations": score.recommendations,
-            "strengths": score.strengths,
-            "metrics": to_serializable(metrics),
-            "quality_issues": to_serializable(issues),
-            "static_analysis": [to_serializable(res) for res in static_results],
-        }
+    def _score_file(self, file_path: str | Path, *, include_details: bool = True) -> Dict[str, Any]:
+        scorer = score_file if include_details else score_file_summary
+        return scorer(
+            self.context.quality_analyzer,
+            self.context.static_analyzer,
+            self.context.quality_scorer,
+            file_path,
+        )
 
-    # ------------------------------------------------------------------ tool specs
-    def _build_tool_specs(self) -> Dict[str, Dict[str, Any]]:
-        return {
-            "analyze_project": {
-                "description": "Analyze the target project and refresh the knowledge graph.",
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "project_root": {"type": "string"},
-                        "force": {
-                            "type": "boolean",
-                            "description": "Force a full re-analysis even if cached data exists",
-                            "default": False,
-                        },
-                        "enable_monitoring": {
-                            "type": "boolean",
-                            "description": "Start smart monitoring after a successful analysis",
-                            "default": False,
-                        },
-                    },
-                    "required": ["project_root"],
-                },
-                "handler": self._handle_analyze_project,
-            },
-            "get_project_summary": {
-                "description": "Retrieve the current project summary including branch and monitoring status.",
-                "schema": {
-                    "type": "object",
-                    "properties": {"project_root": {"type": "string"}},
-                    "required": ["project_root"],
-                },
-                "handler": self._handle_get_project_summary,
-            },
-            "list_branches": {
-                "description": "List analyzed branches for the project.",
-                "schema": {
-                    "type": "object",
-                    "properties": {"project_root": {"type": "string"}},
-                    "required": ["project_root"],
-                },
-                "handler": self._handle_list_branches,
-            },
-            "analyze_branch": {
-                "description": "Analyze a specific Git branch.",
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "project_root": {"type": "string"},
-                        "branch": {"type": "string"},
-                        "force": {"type": "boolean", "default": False},
-                    },
-                    "required": ["project_root", "branch"],
-                },
-                "handler": self._handle_analyze_branch,
-            },
-            "switch_branch": {
-                "description": "Switch analysis context to another branch.",
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "project_root": {"type": "string"},
-                        "branch": {"type": "string"},
-                    },
-                    "required": ["project_root", "branch"],
-                },
-                "handler": self._handle_switch_branch,
-            },
-            "compare_branches": {
-                "description": "Compare two branches and return structural differences.",
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "project_root": {"type": "string"},
-                        "branch_a": {"type": "string"},
-                        "branch_b": {"type": "string"},
-                    },
-                    "required": ["project_root", "branch_a", "branch_b"],
-                },
-                "handler": self._handle_compare_branches,
-            },
-            "start_monitoring": {
-                "description": "Start real-time monitoring for incremental updates.",
-                "schema": {
-                    "type": "object",
-                    "properties": {"project_root": {"type": "string"}},
-                    "required": ["project_root"],
-                },
-                "handler": self._handle_start_monitoring,
-            },
-            "stop_monitoring": {
-                "description": "Stop real-time monitoring.",
-                "schema": {
-                    "type": "object",
-                    "properties": {"project_root": {"type": "string"}},
-                    "required": ["project_root"],
-                },
-                "handler": self._handle_stop_monitoring,
-            },
-            "get_monitoring_status": {
-                "description": "Get the monitoring and incremental update status.",
-                "schema": {
-                    "type": "object",
-                    "properties": {"project_root": {"type": "string"}},
-                    "required": ["project_root"],
-                },
-                "handler": self._handle_get_monitoring_status,
-            },
-            "score_project": {
-                "description": "Compute quality scores for the project.",
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "project_root": {"type": "string"},
-                        "max_files": {"type": "integer", "minimum": 1, "default": 50},
-                        "include_details": {"type": "boolean", "default": False},
-                    },
-                    "required": ["project_root"],
-                },
-                "handler": self._handle_score_project,
-            },
-            "score_file": {
-                "description": "Score a single file and return detailed diagnostics.",
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "project_root": {"type": "string"},
-                        "file_path": {"type": "string"},
-                    },
-                    "required": ["project_root", "file_path"],
-                },
-                "handler": self._handle_score_file,
-            },
-            "get_task_result": {
-                "description": "Fetch the status/result of a previously scheduled task.",
-                "schema": {
-                    "type": "object",
-                    "properties": {"task_id": {"type": "string"}},
-                    "required": ["task_id"],
-                },
-                "handler": self._handle_get_task_result,
-            },
-            "list_tasks": {
-                "description": "List all tracked background tasks.",
-                "schema": {"type": "object", "properties": {}},
-                "handler": self._handle_list_tasks,
-            },
-        }
+    def _abandon_process_pool(self, exc: BaseException) -> None:
+        logger.warning("Scoring process pool unavailable, falling back to threads: %s", exc)
+        self.context.discard_cpu_executor()
 
     # ------------------------------------------------------------------ tool handlers
     def _handle_analyze_project(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
@@ -331,37 +452,80 @@ class ToolHandlers:
         updater = self.context.enhanced_interface._get_updater(project_root)
         return updater.get_update_status()
 
-    def _handle_score_project(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_score_project(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
         project_root = ensure_project_path(arguments["project_root"])
         max_files = int(arguments.get("max_files", 50))
         include_details = bool(arguments.get("include_details", False))
 
-        cached_files = self._get_cached_file_list(project_root)
-        file_paths = cached_files or self._discover_project_files(project_root)
-        file_paths = file_paths[:max_files]
+        # Loading the cached file list and walking the tree both block, so
+        # they run off the event loop; discovery stops at max_files.
+        file_paths = await asyncio.to_thread(self._select_files_to_score, project_root, max_files)
+
+        # Files are scored with a bounded number in flight while the event
+        # loop stays free for other tool calls. Larger batches on multi-core
+        # hosts go to the process pool, since parsing and scoring are mostly
+        # GIL-bound Python. Outcomes are stored by position and reduced in
+        # file order so the response does not depend on completion order.
+        loop = asyncio.get_running_loop()
+        cpu_count = os.cpu_count() or 1
+        use_processes = cpu_count > 1 and len(file_paths) >= _PROCESS_POOL_MIN_FILES
+
+        def submit(index: int) -> asyncio.Future:
+            nonlocal use_processes
+            file_path = file_paths[index]
+            if use_processes:
+                try:
+                    return loop.run_in_executor(
+                        self.context.cpu_executor, score_file_in_worker, file_path, include_details
+                    )
+                except (OSError, BrokenProcessPool, RuntimeError) as exc:
+                    self._abandon_process_pool(exc)
+                    use_processes = False
+            scoring = partial(self._score_file, file_path, include_details=include_details)
+            return loop.run_in_executor(self.context.executor, scoring)
+
+        outcomes: List[Any] = [None] * len(file_paths)
+        pending: Dict[asyncio.Future, int] = {}
+        workers = cpu_count if use_processes else self.context.max_workers
+        max_in_flight = max(1, min(2 * workers, len(file_paths)))
+        next_index = 0
+        while next_index < len(file_paths) or pending:
+            while next_index < len(file_paths) and len(pending) < max_in_flight:
+                pending[submit(next_index)] = next_index
+                next_index += 1
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                exc = future.exception()
+                if isinstance(exc, BrokenProcessPool):
+                    # The file itself did not fail; score it again on threads
+                    if use_processes:
+                        self._abandon_process_pool(exc)
+                        use_processes = False
+                    pending[submit(index)] = index
+                    continue
+                outcomes[index] = exc if exc is not None else future.result()
 
         file_results: List[Dict[str, Any]] = []
-        category_totals: Dict[str, float] = defaultdict(float)
+        category_totals: Dict[str, float] = dict.fromkeys(_CATEGORY_KEYS, 0.0)
         skipped_files: List[str] = []
-
-        for file_path in file_paths:
-            try:
-                result = self._score_file(Path(file_path))
-                file_results.append(result)
-                for category, value in result["category_scores"].items():
-                    category_totals[category] += value
-            except Exception as exc:  # pragma: no cover - log but continue
-                logger.warning("Quality scoring failed for %s: %s", file_path, exc)
+        for file_path, outcome in zip(file_paths, outcomes):
+            if isinstance(outcome, Exception):  # pragma: no cover - log but continue
+                logger.warning("Quality scoring failed for %s: %s", file_path, outcome)
                 skipped_files.append(file_path)
+                continue
+            file_results.append(outcome)
+            for category, value in outcome["category_scores"].items():
+                category_totals[category] = category_totals.get(category, 0.0) + value
 
         file_count = len(file_results)
         average_score = (
             sum(entry["total_score"] for entry in file_results) / file_count if file_count else 0.0
         )
-        category_average = {
-            category: (total / file_count if file_count else 0.0)
-            for category, total in category_totals.items()
-        }
+        category_average: Dict[str, float] = {}
+        if file_count:
+            for category, total in category_totals.items():
+                category_average[category] = total / file_count
 
         response: Dict[str, Any] = {
             "project_root": project_root,
@@ -374,6 +538,7 @@ class ToolHandlers:
         if include_details:
             response["files"] = file_results
         else:
+            # Summary entries only carry category_scores for the totals above
             response["files"] = [
                 {
                     "file_path": entry["file_path"],
@@ -388,7 +553,7 @@ class ToolHandlers:
     def _handle_score_file(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
         project_root = ensure_project_path(arguments["project_root"])
         file_path = self._resolve_file_path(project_root, arguments["file_path"])
-        if not file_path.exists():
+        if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         return self._score_file(file_path)
 
@@ -4,42 +4,141 @@ from __future__ import annotations
 
 import dataclasses
 import logging
+import os
+from collections import deque
 from datetime import datetime
-from pathlib import Path
-from typing import Any
+from functools import lru_cache
+from pathlib import Path, PosixPath, WindowsPath
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
 def ensure_project_path(project_root: str) -> str:
     """Resolve project root to an absolute path and warn if missing."""
-    resolved = Path(project_root).expanduser().resolve()
+    expanded = os.path.expanduser(project_root)
+    # Relative roots depend on the working directory, so it is part of the key
+    cwd = None if os.path.isabs(expanded) else os.getcwd()
+    return _resolve_project_path(expanded, cwd)
+
+
+@lru_cache(maxsize=256)
+def _resolve_project_path(project_root: str, cwd: Optional[str]) -> str:
+    """Memoised ``resolve()``; the existence warning is only logged on a miss."""
+    resolved = (Path(cwd, project_root) if cwd else Path(project_root)).resolve()
     if not resolved.exists():
         logger.warning("Project root does not exist: %s", resolved)
     return str(resolved)
 
 
 def to_serializable(value: Any) -> Any:
-    """Convert complex objects to JSON-serialisable structures."""
-    if isinstance(value, (str, int, float, bool)) or value is None:
+    """Convert complex objects to JSON-serialisable structures.
+
+    The tree is walked with an explicit worklist rather than recursion, so
+    nested results cost no Python frame per node and cannot hit the
+    recursion limit. Each container is converted into an empty output whose
+    scalar children are written directly; other children get a placeholder
+    slot and are queued as ``(output, slot, child)``. The queue is FIFO so
+    children are converted in source order.
+    """
+    if type(value) in _SCALAR_TYPES:
         return value
 
+    scalar_types = _SCALAR_TYPES
+    converters = _CONVERTERS
+    dataclass_fields = _DATACLASS_FIELDS
+    holder: List[Any] = [None]
+    pending: Deque[Tuple[Any, Any, Any]] = deque([(holder, 0, value)])
+    push = pending.append
+    pop = pending.popleft
+    while pending:
+        parent, slot, item = pop()
+        kind = type(item)
+        converter = converters.get(kind)
+        if converter is not None:
+            parent[slot] = converter(item)
+            continue
+        names = dataclass_fields.get(kind)
+        if names is not None:
+            out: Any = {}
+            for name in names:
+                child = getattr(item, name)
+                if type(child) in scalar_types:
+                    out[name] = child
+                else:
+                    out[name] = None
+                    push((out, name, child))
+        elif kind is dict:
+            out = {}
+            for key, child in item.items():
+                key = str(key)
+                if type(child) in scalar_types:
+                    out[key] = child
+                else:
+                    out[key] = None
+                    push((out, key, child))
+        elif kind is list or kind is tuple or kind is set:
+            out = list(item)
+            for index, child in enumerate(out):
+                if type(child) not in scalar_types:
+                    push((out, index, child))
+        else:
+            is_leaf, out = _convert_slow(item)
+            if not is_leaf:
+                # Container subclass, newly learned dataclass or enum value
+                push((parent, slot, out))
+                continue
+        parent[slot] = out
+    return holder[0]
+
+
+def _convert_slow(value: Any) -> Tuple[bool, Any]:
+    """Fallback for types without an exact-type entry (subclasses, enums...).
+
+    Returns ``(True, result)`` for leaves, or ``(False, replacement)`` when the
+    value should be queued again in a form the fast path understands.
+    """
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return True, value
+
     if isinstance(value, datetime):
-        return value.isoformat()
+        return True, value.isoformat()
 
     if isinstance(value, Path):
-        return str(value)
+        return True, str(value)
 
-    if dataclasses.is_dataclass(value):
-        return to_serializable(dataclasses.asdict(value))
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        # Remember the field names for this dataclass type so later instances
+        # take the fast path. Fields are read directly instead of through
+        # dataclasses.asdict, which would deep-copy the tree first.
+        _DATACLASS_FIELDS[type(value)] = tuple(field.name for field in dataclasses.fields(value))
+        return False, value
 
     if isinstance(value, dict):
-        return {str(k): to_serializable(v) for k, v in value.items()}
+        return False, dict(value)
 
     if isinstance(value, (list, tuple, set)):
-        return [to_serializable(item) for item in value]
+        return False, list(value)
 
     if hasattr(value, "value"):
-        return to_serializable(getattr(value, "value"))
+        return False, getattr(value, "value")
+
+    return True, str(value)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+# Exact-type dispatch for leaves; containers are handled in to_serializable.
+_CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    **dict.fromkeys(_SCALAR_TYPES, _identity),
+    datetime: datetime.isoformat,
+    PosixPath: str,
+    WindowsPath: str,
+}
 
-    return str(value)
+# Field names per dataclass type, learned on first sight.
+_DATACLASS_FIELDS: Dict[type, Tuple[str, ...]] = {}
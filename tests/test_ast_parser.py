@@ -1,4 +1,7 @@
-from project_quality_hub.quality.ast_parser import TreeSitterParser
+import pytest
+
+from project_quality_hub.quality import ast_parser
+from project_quality_hub.quality.ast_parser import QualityAnalyzer, TreeSitterParser
 
 
 def test_detect_language_supports_python_and_unknown():
@@ -7,6 +10,7 @@ def test_detect_language_supports_python_and_unknown():
     assert parser.detect_language("module.py") == "python"
     assert parser.detect_language("component.tsx") == "typescript"
     assert parser.detect_language("archive.custom") is None
+    assert TreeSitterParser.detect_language("lib.RS") == "rust"
 
 
 def test_parse_file_returns_metrics(tmp_path):
@@ -29,3 +33,156 @@ def test_parse_file_returns_metrics(tmp_path):
     assert metrics.lines_of_code > 0
     assert 0 <= metrics.maintainability_index <= 100
     assert metrics.technical_debt_minutes >= 0
+
+
+def test_cyclomatic_complexity_matches_whole_keywords_only():
+    parser = TreeSitterParser()
+    code = "\n".join(
+        [
+            "def classify(identifier, format_string):",
+            "    if identifier and format_string:",
+            "        return 1",
+            "    elif identifier:",
+            "        return 2",
+            "    return 0",
+        ]
+    )
+
+    # if + and + elif on top of the base complexity of 1
+    assert parser._calculate_cyclomatic_complexity(code.encode(), "python") == 4
+
+
+def test_analyze_files_matches_single_file_results(tmp_path):
+    paths = []
+    for index in range(3):
+        file_path = tmp_path / f"module_{index}.py"
+        file_path.write_text(f"def f{index}(x):\n    if x:\n        return {index}\n", encoding="utf-8")
+        paths.append(str(file_path))
+
+    analyzer = QualityAnalyzer()
+    results = analyzer.analyze_files(paths, max_workers=2)
+
+    assert [metrics.file_path for metrics, _ in results] == paths
+    assert results == [analyzer.analyze_file(path) for path in paths]
+
+
+def test_parse_file_mmap_path_matches_buffered_read(tmp_path, monkeypatch):
+    code = "\n".join(
+        ["class Service:", "    def run(self, items):", "        for item in items:", "            if item:", "                yield item"]
+        * 4
+    )
+    file_path = tmp_path / "service.py"
+    file_path.write_text(code, encoding="utf-8")
+
+    buffered = TreeSitterParser().parse_file(str(file_path))
+    monkeypatch.setattr(ast_parser, "_MMAP_THRESHOLD", 0)
+    mapped = TreeSitterParser().parse_file(str(file_path))
+
+    assert mapped == buffered
+
+
+def test_parse_file_reuses_metrics_until_file_changes(tmp_path):
+    file_path = tmp_path / "cached.py"
+    file_path.write_text("def first():\n    return 1\n", encoding="utf-8")
+
+    parser = TreeSitterParser()
+    first = parser.parse_file(str(file_path))
+    assert parser.parse_file(str(file_path)) is first
+
+    file_path.write_text("def first():\n    return 1\n\n\ndef second():\n    return 2\n", encoding="utf-8")
+    second = parser.parse_file(str(file_path))
+
+    assert second is not first
+    assert second.function_count == 2
+
+
+def test_python_metrics_ignore_keywords_in_strings_and_comments(tmp_path):
+    body = "\n".join(f"    total += {index}" for index in range(60))
+    code = "\n".join(
+        [
+            '"""Module docstring mentioning class and def if for while."""',
+            "",
+            "# if this comment were code it would branch",
+            "class Report:",
+            "    async def build(self, rows):",
+            "        if rows and self:",
+            "            return 1",
+            "        elif rows:",
+            "            return 2",
+            "        return 0",
+            "",
+            "",
+            "def summarise():",
+            "    total = 0",
+            body,
+            "    return total",
+        ]
+    )
+    file_path = tmp_path / "report.py"
+    file_path.write_text(code, encoding="utf-8")
+
+    metrics = TreeSitterParser().parse_file(str(file_path))
+
+    assert metrics.class_count == 1
+    assert metrics.function_count == 2
+    # if + and + elif on top of the base complexity of 1
+    assert metrics.cyclomatic_complexity == 4
+    assert metrics.max_nesting_depth == 3
+    assert metrics.long_functions == [("summarise", 62)]
+
+
+def test_tree_sitter_counts_non_python_structure(tmp_path):
+    pytest.importorskip("tree_sitter_languages")
+    code = "\n".join(
+        [
+            "class Greeter {",
+            "  greet(name) { return name ? `hi ${name}` : 'hi'; }",
+            "}",
+            "const classify = (a, b) => (a && b) || null;",
+            "// function class if while",
+        ]
+    )
+    file_path = tmp_path / "greeter.js"
+    file_path.write_text(code, encoding="utf-8")
+
+    metrics = TreeSitterParser().parse_file(str(file_path))
+
+    assert metrics.class_count == 1
+    assert metrics.function_count == 2
+    assert metrics.cyclomatic_complexity == 4
+
+
+def test_count_functions_matches_signatures_not_modifiers():
+    parser = TreeSitterParser()
+    java = b"""public class Account {
+    private int balance;
+    private final Map<String, List<Integer>> history = new HashMap<>();
+    public Account() {}
+    public static <T> List<T> wrap(T value) { return null; }
+    protected void close() throws IOException {}
+}"""
+    python = b'def top():\n    async def inner(x):\n        return "def fake()"\n'
+
+    assert parser._count_functions(java, "java") == 3
+    assert parser._count_functions(python, "python") == 2
+
+
+def test_duplicate_detection_can_be_skipped():
+    parser = TreeSitterParser()
+    lines = [b"a = 1", b"b = 2", b"c = 3"] * 2
+
+    assert parser._find_duplicated_code(lines) == [(1, 3, 4, 6)]
+    assert parser._find_duplicated_code(lines[:5]) == []
+
+    parser.skip_duplicate_detection = True
+    assert parser._find_duplicated_code(lines) == []
+
+
+def test_streaming_duplicate_detection_for_huge_files(tmp_path, monkeypatch):
+    file_path = tmp_path / "generated.js"
+    file_path.write_text("a = 1;\nb = 2;\n\nc = 3;\n" * 3, encoding="utf-8")
+
+    monkeypatch.setattr(ast_parser, "_STREAMING_DUPLICATE_THRESHOLD", 0)
+    metrics = TreeSitterParser().parse_file(str(file_path))
+
+    assert metrics.duplicated_code_blocks == [(1, 3, 4, 6), (2, 4, 5, 7), (3, 5, 6, 8), (1, 3, 7, 9)]
@@ -0,0 +1,17 @@
+import os
+
+from project_quality_hub.core.project_memory import ProjectMemoryManager
+
+
+def test_storage_version_tracks_project_cache_file(tmp_path):
+    manager = ProjectMemoryManager(str(tmp_path / "storage"))
+    project_root = str(tmp_path / "project")
+
+    cache_version, db_version = manager.storage_version(project_root)
+    assert cache_version == 0
+    assert db_version > 0
+
+    cache_file = manager.cache_dir / f"{manager.get_project_id(project_root)}.pkl"
+    cache_file.write_bytes(b"")
+    os.utime(cache_file, ns=(1, 1_000_000_000))
+    assert manager.storage_version(project_root) == (1_000_000_000, db_version)
@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+from enum import Enum
+
+import pytest
+
+from project_quality_hub.core import project_mind_interface as interface
+
+orjson = pytest.importorskip("orjson")
+
+
+class _Level(Enum):
+    HIGH = "high"
+
+
+def test_json_fallback_matches_orjson_output(monkeypatch):
+    payload = {
+        "path": "模块.py",
+        "when": datetime(2024, 5, 1, 12, 30, 0, 250, tzinfo=timezone.utc),
+        "naive": datetime(2024, 5, 1, 12, 30),
+        "level": _Level.HIGH,
+        "counts": {1: [1, 2.5, None, True]},
+    }
+    expected = interface._dumps(payload)
+
+    monkeypatch.setattr(interface, "orjson", None)
+    assert interface._dumps(payload) == expected
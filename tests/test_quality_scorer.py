@@ -6,6 +6,7 @@ from project_quality_hub.quality import (
     QualityIssue,
     QualityScore,
 )
+from project_quality_hub.quality import quality_scorer
 from project_quality_hub.quality.static_analyzers import StaticAnalysisResult
 
 
@@ -49,8 +50,8 @@ def test_quality_score_surfaces_security_and_complexity_issues():
         cyclomatic_complexity=28,
         cognitive_complexity=40,
         max_nesting_depth=6,
-        long_functions=["def very_long_function(): ..."],
-        duplicated_code_blocks=["duplicate_block"],
+        long_functions=[("very_long_function", 80)],
+        duplicated_code_blocks=[(10, 12, 40, 42)],
         maintainability_index=45.0,
         technical_debt_minutes=540,
     )
@@ -105,3 +106,62 @@ def test_quality_score_surfaces_security_and_complexity_issues():
     assert any(item.startswith("🚨 Security") for item in score.priority_issues)
     assert any("Complexity" in item for item in score.priority_issues)
     assert any("security issues" in recommendation for recommendation in score.recommendations)
+
+
+def test_static_results_are_tallied_once_per_category_and_severity():
+    scorer = IntelligentQualityScorer()
+
+    def result(category, severity, rule_id="X1"):
+        return StaticAnalysisResult(
+            tool_name="Bandit",
+            file_path="sample.py",
+            line=1,
+            column=1,
+            severity=severity,
+            rule_id=rule_id,
+            message="finding",
+            category=category,
+            suggestion="",
+            auto_fixable=False,
+        )
+
+    tally = scorer._tally_static_results(
+        [
+            result("security", "error", "B602"),
+            result("security", "info"),
+            result("style", "warning"),
+            result("style", "warning", "B602"),
+        ]
+    )
+
+    assert tally.counts[("style", "warning")] == 2
+    assert tally.high_risk_hits == 1
+    assert tally.severities == {"error": 1, "info": 1, "warning": 2}
+    assert scorer._calculate_security_score(tally) == 100 - 25 - 3 - 15
+
+
+def test_grade_boundaries_are_inclusive_lower_bounds():
+    grades = [QualityScore(total_score=value).grade for value in (59.9, 60, 70, 80, 89.9, 90, 95)]
+
+    assert grades == ["F", "D", "C", "B", "B", "A", "A+"]
+
+
+def test_score_project_matches_single_file_scores():
+    scorer = IntelligentQualityScorer()
+    files = [
+        (_base_metrics(cyclomatic_complexity=value, file_path=f"module_{value}.py"), [], [])
+        for value in (2, 12, 30)
+    ]
+
+    scores = scorer.score_project(files, max_workers=2)
+
+    assert scores == [scorer.calculate_quality_score(*entry) for entry in files]
+
+
+def test_estimated_maintainability_index_is_cached_per_metric_tuple():
+    scorer = IntelligentQualityScorer()
+    metrics = _base_metrics(lines_of_code=150, long_functions=[("run", 70)])
+
+    assert scorer._estimate_maintainability_index(metrics) == 100 - 12 - 12 - 5 - 5
+    assert scorer._estimate_maintainability_index(replace(metrics, file_path="other.py")) == 66
+    assert quality_scorer._estimate_mi.cache_info().hits >= 1
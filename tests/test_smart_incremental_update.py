@@ -0,0 +1,198 @@
+import errno
+import os
+import queue
+from datetime import datetime
+
+import pytest
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers.polling import PollingObserver
+
+from project_quality_hub.core.project_mind import FileNode, ProjectKnowledgeGraph
+from project_quality_hub.core.smart_incremental_update import (
+    FileChangeInfo,
+    InotifyObserver,
+    SmartIncrementalUpdater,
+    inotify_simple,
+)
+
+requires_inotify = pytest.mark.skipif(inotify_simple is None, reason="inotify_simple not installed")
+
+
+class _RecordingHandler(FileSystemEventHandler):
+    def __init__(self):
+        self.events = queue.Queue()
+
+    def on_any_event(self, event):
+        self.events.put((event.event_type, event.src_path))
+
+
+def _wait_for(handler, path, timeout=5.0):
+    seen = []
+    while True:
+        try:
+            event = handler.events.get(timeout=timeout)
+        except queue.Empty:
+            return seen
+        seen.append(event)
+        if event[1] == path:
+            return seen
+
+
+def _updater(tmp_path, monkeypatch) -> SmartIncrementalUpdater:
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    return SmartIncrementalUpdater(str(tmp_path))
+
+
+def test_order_changes_visits_dependencies_first(tmp_path, monkeypatch):
+    updater = _updater(tmp_path, monkeypatch)
+    graph = ProjectKnowledgeGraph(str(tmp_path))
+    # app -> service -> model
+    graph.graph.add_edge("app.py", "service.py")
+    graph.graph.add_edge("service.py", "model.py")
+
+    changes = {
+        path: FileChangeInfo(file_path=path, change_type="modified")
+        for path in ("app.py", "service.py", "model.py")
+    }
+
+    assert updater._order_changes(graph, changes) == ["model.py", "service.py", "app.py"]
+
+
+def test_order_changes_keeps_cycles(tmp_path, monkeypatch):
+    updater = _updater(tmp_path, monkeypatch)
+    graph = ProjectKnowledgeGraph(str(tmp_path))
+    graph.graph.add_edge("a.py", "b.py")
+    graph.graph.add_edge("b.py", "a.py")
+    graph.graph.add_edge("c.py", "a.py")
+
+    changes = {
+        path: FileChangeInfo(file_path=path, change_type="modified")
+        for path in ("a.py", "b.py", "c.py")
+    }
+
+    ordered = updater._order_changes(graph, changes)
+    assert sorted(ordered) == ["a.py", "b.py", "c.py"]
+
+
+def test_invalidate_dependents_marks_reverse_reachable_files(tmp_path):
+    graph = ProjectKnowledgeGraph(str(tmp_path))
+    for path in ("app.py", "service.py", "model.py", "other.py"):
+        graph.files[path] = FileNode(path, "python", 0, 0, datetime.now(), "")
+    graph.graph.add_edge("app.py", "service.py")
+    graph.graph.add_edge("service.py", "model.py")
+    graph.graph.add_node("other.py")
+
+    dirty = graph.invalidate_dependents({"model.py"})
+
+    assert dirty == {"service.py", "app.py"}
+    assert graph.files["app.py"].dirty
+    assert not graph.files["other.py"].dirty
+
+    graph.recompute_scores(dirty)
+    assert not graph.files["app.py"].dirty
+
+
+def test_force_polling_is_resolved_at_init(tmp_path, monkeypatch):
+    monkeypatch.setenv("WATCHDOG_FORCE_POLLING", "1")
+    updater = _updater(tmp_path, monkeypatch)
+    monkeypatch.setenv("WATCHDOG_FORCE_POLLING", "0")
+
+    assert updater._candidate_observers() == (PollingObserver,)
+
+
+@pytest.mark.parametrize("change_type", ["created", "modified"])
+def test_files_created_together_are_linked_like_a_full_analysis(tmp_path, monkeypatch, change_type):
+    updater = _updater(tmp_path, monkeypatch)
+    existing = tmp_path / "c.js"
+    existing.write_text("import { fb } from './b'\n", encoding="utf-8")
+    graph = ProjectKnowledgeGraph(str(tmp_path))
+    graph.files[str(existing)] = graph._analyze_single_file(existing)
+    graph._link_file(str(existing), graph.files[str(existing)])
+
+    a_path, b_path = tmp_path / "a.js", tmp_path / "b.js"
+    a_path.write_text("import { fb } from './b'\nexport const fa = 1\n", encoding="utf-8")
+    b_path.write_text("export const fb = 2\n", encoding="utf-8")
+    saved = []
+    monkeypatch.setattr(updater.memory_manager, "load_project", lambda root: graph)
+    monkeypatch.setattr(updater.memory_manager, "save_project", saved.append)
+
+    # a.js is processed before b.js, and the graph has no edge between them yet
+    updater._process_file_changes(
+        {
+            # A created event is usually followed by modified; the batch keeps the latter
+            str(path): FileChangeInfo(file_path=str(path), change_type=change_type)
+            for path in (a_path, b_path)
+        }
+    )
+
+    assert saved == [graph]
+    assert graph.graph.has_edge(str(a_path), str(b_path))
+    assert graph.graph.has_edge(str(existing), str(b_path))
+
+
+@requires_inotify
+def test_inotify_reports_files_written_into_new_directories(tmp_path):
+    handler = _RecordingHandler()
+    observer = InotifyObserver(read_timeout_ms=100, read_delay_ms=0)
+    observer.schedule(handler, str(tmp_path), recursive=True)
+    observer.start()
+    try:
+        # The file is usually written before the new directory is watched and is
+        # reported by the directory scan; if the watch wins, the write reports it
+        os.makedirs(tmp_path / "sub" / "deeper")
+        nested = tmp_path / "sub" / "deeper" / "x.py"
+        nested.write_text("x = 1\n", encoding="utf-8")
+
+        seen = _wait_for(handler, str(nested))
+        assert seen and seen[-1][1] == str(nested)
+    finally:
+        observer.stop()
+        observer.join(5)
+
+
+@requires_inotify
+def test_inotify_start_fails_for_missing_root(tmp_path):
+    observer = InotifyObserver()
+    observer.schedule(_RecordingHandler(), str(tmp_path / "missing"), recursive=True)
+
+    with pytest.raises(OSError):
+        observer.start()
+    assert not observer.is_alive()
+
+
+@requires_inotify
+def test_inotify_start_fails_when_watch_limit_is_reached(tmp_path, monkeypatch):
+    (tmp_path / "sub").mkdir()
+    original = inotify_simple.INotify.add_watch
+
+    def add_watch(self, path, mask):
+        if os.fspath(path).endswith("sub"):
+            raise OSError(errno.ENOSPC, "inotify watch limit reached")
+        return original(self, path, mask)
+
+    monkeypatch.setattr(inotify_simple.INotify, "add_watch", add_watch)
+    observer = InotifyObserver()
+    observer.schedule(_RecordingHandler(), str(tmp_path), recursive=True)
+
+    with pytest.raises(OSError):
+        observer.start()
+
+
+@requires_inotify
+def test_monitoring_falls_back_when_inotify_thread_dies(tmp_path, monkeypatch):
+    updater = _updater(tmp_path, monkeypatch)
+    updater._observer_candidates = (InotifyObserver, PollingObserver)
+    updater.start_monitoring()
+    inotify_observer = updater.observer
+    try:
+        assert updater._observer_class is InotifyObserver
+
+        # The monitor thread calls this when it dies
+        inotify_observer.on_error(RuntimeError("read failed"))
+
+        assert updater.monitoring
+        assert updater._observer_class is PollingObserver
+    finally:
+        inotify_observer.stop()
+        inotify_observer.join(5)
+        updater.stop_monitoring()
@@ -0,0 +1,302 @@
+import json
+import os
+import subprocess
+import threading
+
+import pytest
+
+from project_quality_hub.quality.static_analyzers import (
+    BanditAnalyzer,
+    ESLintAnalyzer,
+    MultiLanguageStaticAnalyzer,
+    PyFlakesAnalyzer,
+    StaticAnalysisResult,
+    StaticAnalyzer,
+)
+
+
+class _FakeAnalyzer(StaticAnalyzer):
+    def __init__(self, name, barrier=None, fail=False):
+        self.name = name
+        self.barrier = barrier
+        self.fail = fail
+
+    def analyze_file(self, file_path):
+        if self.barrier is not None:
+            # Both analyzers must run at the same time to pass the barrier
+            self.barrier.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError("tool crashed")
+        return [
+            StaticAnalysisResult(
+                tool_name=self.name,
+                file_path=file_path,
+                line=1,
+                column=1,
+                severity="warning",
+                rule_id=self.name,
+                message="finding",
+                category="style",
+            )
+        ]
+
+    def is_available(self):
+        return True
+
+
+class _BatchAnalyzer(_FakeAnalyzer):
+    def __init__(self, name):
+        super().__init__(name)
+        self.calls = []
+
+    def analyze_files(self, file_paths):
+        self.calls.append(list(file_paths))
+        return {path: self.analyze_file(path) for path in file_paths}
+
+
+def test_python_analyzers_run_concurrently_in_registration_order(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("x = 1\n", encoding="utf-8")
+    barrier = threading.Barrier(2)
+
+    analyzer = MultiLanguageStaticAnalyzer()
+    analyzer.analyzers["python"] = [_FakeAnalyzer("first", barrier), _FakeAnalyzer("second", barrier)]
+    try:
+        results = analyzer.analyze_file(str(file_path))
+    finally:
+        analyzer.shutdown()
+
+    assert [result.tool_name for result in results] == ["first", "second"]
+
+
+def test_failing_analyzer_does_not_drop_sibling_results(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("x = 1\n", encoding="utf-8")
+
+    analyzer = MultiLanguageStaticAnalyzer()
+    analyzer.analyzers["python"] = [_FakeAnalyzer("broken", fail=True), _FakeAnalyzer("ok")]
+    try:
+        results = analyzer.analyze_file(str(file_path))
+    finally:
+        analyzer.shutdown()
+
+    assert [result.tool_name for result in results] == ["ok"]
+
+
+def test_eslint_output_is_grouped_by_reported_file(tmp_path):
+    first = str(tmp_path / "a.js")
+    second = str(tmp_path / "b.js")
+    output = json.dumps(
+        [
+            {"filePath": first, "messages": [{"ruleId": "no-var", "severity": 2, "line": 3, "column": 1, "message": "m"}]},
+            {"filePath": second, "messages": [{"ruleId": "no-eval", "severity": 1, "line": 7, "column": 2, "message": "m"}]},
+        ]
+    )
+
+    results = ESLintAnalyzer()._parse_eslint_output(output, [first, second])
+
+    assert [(r.rule_id, r.severity, r.line) for r in results[first]] == [("no-var", "error", 3)]
+    assert [(r.rule_id, r.category) for r in results[second]] == [("no-eval", "security")]
+
+
+def test_analyze_files_batches_each_language_once(tmp_path):
+    paths = []
+    for name in ("a.py", "b.py", "notes.txt"):
+        path = tmp_path / name
+        path.write_text("x = 1\n", encoding="utf-8")
+        paths.append(str(path))
+
+    batch = _BatchAnalyzer("batch")
+    analyzer = MultiLanguageStaticAnalyzer()
+    analyzer.analyzers["python"] = [batch]
+    try:
+        results = analyzer.analyze_files(paths)
+    finally:
+        analyzer.shutdown()
+
+    assert batch.calls == [paths[:2]]
+    assert sorted(results) == paths[:2]
+    assert [r.tool_name for r in results[paths[0]]] == ["batch"]
+
+
+def test_eslint_cache_location_follows_config(tmp_path):
+    analyzer = ESLintAnalyzer(cache_dir=tmp_path / "cache")
+
+    args = analyzer._cache_args()
+    analyzer.config["rules"]["no-console"] = "off"
+
+    assert args[0] == "--cache" and args[-2:] == ["--cache-strategy", "content"]
+    assert (tmp_path / "cache").is_dir()
+    assert analyzer._cache_args()[2] != args[2]
+
+
+def test_eslint_config_file_is_shared_and_kept(tmp_path):
+    analyzer = ESLintAnalyzer(cache_dir=tmp_path / "cache")
+
+    config_text, digest = analyzer._serialized_config()
+    path = analyzer._config_file(config_text, digest)
+
+    assert os.path.dirname(path) == str(tmp_path / "cache")
+    assert json.loads(open(path, encoding="utf-8").read()) == analyzer.config
+    # Other instances (or processes) with the same config reuse the file, and
+    # shutting an analyzer down does not delete it
+    other = ESLintAnalyzer(cache_dir=tmp_path / "cache")
+    assert other._config_file(config_text, digest) == path
+    multi = MultiLanguageStaticAnalyzer()
+    multi.shutdown()
+    assert os.path.exists(path)
+
+
+def test_pyflakes_message_profiles():
+    analyzer = PyFlakesAnalyzer()
+    output = "\n".join(
+        [
+            "m.py:1: 'os' imported but unused",
+            "m.py:2: undefined name 'x'",
+            "m.py:3: redefinition of unused 'y' from line 1",
+            "m.py:4: local variable 'z' is assigned to but never used",
+        ]
+    )
+
+    results = analyzer._parse_pyflakes_output(output, "m.py")
+
+    assert [(r.severity, r.category) for r in results] == [
+        ("warning", "style"),
+        ("warning", "style"),
+        ("warning", "general"),
+        ("warning", "general"),
+    ]
+    assert results[3].suggestion is None
+    assert analyzer._determine_severity("function 'f' redefined") == "info"
+
+
+def test_availability_probe_runs_once_per_analyzer(monkeypatch):
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="1.7.5\n", stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    analyzer = BanditAnalyzer()
+
+    assert analyzer.is_available()
+    assert analyzer.is_available()
+    assert len(calls) == 1
+
+
+def test_pyflakes_runs_in_process_without_subprocess(tmp_path, monkeypatch):
+    pytest.importorskip("pyflakes")
+    file_path = tmp_path / "module.py"
+    file_path.write_text("import os\n", encoding="utf-8")
+
+    def fail_run(*args, **kwargs):
+        raise AssertionError("subprocess should not be used")
+
+    monkeypatch.setattr(subprocess, "run", fail_run)
+    results = PyFlakesAnalyzer().analyze_file(str(file_path))
+
+    assert [(r.line, r.column, r.category) for r in results] == [(1, 1, "style")]
+    assert results[0].message == "'os' imported but unused"
+
+
+def test_pyflakes_output_with_columns_and_drive_letters():
+    output = "C:\\src\\m.py:12:5: undefined name 'x'\r\nC:\\src\\m.py:3: 'os' imported but unused\n"
+
+    results = PyFlakesAnalyzer()._parse_pyflakes_output(output, "m.py")
+
+    assert [(r.line, r.column, r.message) for r in results] == [
+        (12, 5, "undefined name 'x'"),
+        (3, 1, "'os' imported but unused"),
+    ]
+
+
+def test_unchanged_files_are_served_from_result_cache(tmp_path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("x = 1\n", encoding="utf-8")
+
+    class _CountingAnalyzer(_FakeAnalyzer):
+        calls = 0
+
+        def analyze_file(self, file_path):
+            type(self).calls += 1
+            return super().analyze_file(file_path)
+
+    analyzer = MultiLanguageStaticAnalyzer()
+    analyzer.analyzers["python"] = [_CountingAnalyzer("counting")]
+    try:
+        first = analyzer.analyze_file(str(file_path))
+        assert analyzer.analyze_file(str(file_path)) == first
+        assert analyzer.analyze_files([str(file_path)])[str(file_path)] == first
+        assert _CountingAnalyzer.calls == 1
+
+        file_path.write_text("x = 2\n", encoding="utf-8")
+        analyzer.analyze_file(str(file_path))
+        assert _CountingAnalyzer.calls == 2
+    finally:
+        analyzer.shutdown()
+
+
+def test_availability_probes_run_concurrently():
+    barrier = threading.Barrier(2)
+
+    class _SlowProbe(_FakeAnalyzer):
+        def is_available(self):
+            barrier.wait(timeout=5)
+            return self.name == "present"
+
+    analyzer = MultiLanguageStaticAnalyzer()
+    analyzer.analyzers = {"python": [_SlowProbe("present"), _SlowProbe("missing")]}
+    try:
+        assert analyzer.get_available_analyzers() == {"python": ["_SlowProbe"]}
+    finally:
+        analyzer.shutdown()
+
+
+def test_javascript_and_typescript_share_one_eslint_batch(tmp_path):
+    paths = []
+    for name in ("a.js", "b.ts"):
+        path = tmp_path / name
+        path.write_text("let x = 1;\n", encoding="utf-8")
+        paths.append(str(path))
+
+    analyzer = MultiLanguageStaticAnalyzer()
+    assert analyzer.analyzers["javascript"] is analyzer.analyzers["typescript"]
+    shared = _BatchAnalyzer("eslint")
+    analyzer.analyzers["javascript"] = analyzer.analyzers["typescript"] = shared
+
+    try:
+        results = analyzer.analyze_files(paths)
+    finally:
+        analyzer.shutdown()
+
+    assert shared.calls == [paths]
+    assert all(len(results[path]) == 1 for path in paths)
+
+
+def test_failed_tool_runs_are_not_cached(tmp_path, monkeypatch):
+    file_path = tmp_path / "module.py"
+    file_path.write_text("exec('x')\n", encoding="utf-8")
+    report = json.dumps(
+        {"results": [{"filename": str(file_path), "test_id": "B102", "issue_severity": "MEDIUM", "line_number": 1}]}
+    )
+    runs = []
+
+    def fake_run(cmd, **kwargs):
+        if "--version" in cmd:
+            return subprocess.CompletedProcess(cmd, 0, stdout="bandit 1.7.5\n  python version = 3\n", stderr="")
+        runs.append(cmd)
+        if len(runs) == 1:
+            raise subprocess.TimeoutExpired(cmd, 1)
+        return subprocess.CompletedProcess(cmd, 1, stdout=report, stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    bandit = BanditAnalyzer()
+    analyzer = MultiLanguageStaticAnalyzer()
+    analyzer.analyzers["python"] = [bandit]
+
+    assert analyzer.analyze_file(str(file_path)) == []
+    assert [r.rule_id for r in analyzer.analyze_file(str(file_path))] == ["B102"]
+    assert [r.rule_id for r in analyzer.analyze_file(str(file_path))] == ["B102"]
+    assert len(runs) == 2
+    assert bandit.cache_token() == "BanditAnalyzer:bandit 1.7.5"